@@ -536,7 +536,7 @@ async def _parse_tool_results(state: ConversationState) -> Dict[str, Any]:
     updates = {}
 
     # Get slot updates from the global store (legacy, to be migrated)
-    from app.tools.slot_tools import get_pending_updates
+    from app.tools.slot_tools import get_pending_updates, SLOT_FIELDS
     from app.schemas.state import BookingSlots, ConfirmedAppointment
     from app.schemas.customer import CustomerContext
     from app.schemas.enums import AppointmentType
@@ -558,8 +558,7 @@ async def _parse_tool_results(state: ConversationState) -> Dict[str, Any]:
             elif appt_type == "test_drive":
                 slots.appointment_type = AppointmentType.TEST_DRIVE
 
-        for field in ["service_type", "vehicle_interest", "preferred_date",
-                      "preferred_time", "customer_name", "customer_phone", "customer_email"]:
+        for field in SLOT_FIELDS[1:]:  # appointment_type handled above
             if field in raw_updates:
                 setattr(slots, field, raw_updates[field])
 
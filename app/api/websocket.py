@@ -4,6 +4,11 @@ import json
 import asyncio
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 from app.background.state_store import state_store
 from app.schemas.api import WSStateUpdate, WSTranscript, WSTaskUpdate, WSError
 
@@ -14,6 +19,13 @@ def json_serial(obj):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
+
+def dumps_message(message: dict) -> str:
+    """Serialize a WebSocket message once (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(message, default=json_serial, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=json_serial)
+
 router = APIRouter()
 
 
@@ -77,7 +89,7 @@ class SalesConnectionManager:
             return {"accepted": False, "reason": "no_sales_online"}
 
         # Create future for this escalation
-        future = asyncio.get_event_loop().create_future()
+        future = asyncio.get_running_loop().create_future()
         self._pending_escalations[session_id] = future
 
         # Send ring to all sales dashboards
@@ -156,15 +168,17 @@ class ConnectionManager:
 
     async def broadcast(self, session_id: str, message: dict):
         """Broadcast message to all connections for a session."""
+        # Serialize with datetime support
+        await self.broadcast_text(session_id, dumps_message(message))
+
+    async def broadcast_text(self, session_id: str, text: str):
+        """Broadcast an already-serialized JSON message to a session."""
         async with self._lock:
             connections = self.connections.get(session_id, set()).copy()
 
-        # Serialize with datetime support
-        json_message = json.loads(json.dumps(message, default=json_serial))
-
         for websocket in connections:
             try:
-                await websocket.send_json(json_message)
+                await websocket.send_text(text)
             except Exception as e:
                 print(f"Error broadcasting to websocket: {e}")
 
@@ -114,7 +114,7 @@ class AudioProcessor:
 
         # Lazy load model
         if not self._stt_loaded:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(_executor, self._load_stt)
 
         if self._stt is None:
@@ -126,7 +126,7 @@ class AudioProcessor:
             audio_array = self._bytes_to_numpy(audio_data)
 
             # Run transcription in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             def _transcribe():
                 segments, info = self._stt.transcribe(
@@ -181,7 +181,7 @@ class AudioProcessor:
 
         # Lazy load model
         if not self._tts_loaded:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(_executor, self._load_tts)
 
         if self._tts is None:
@@ -191,7 +191,7 @@ class AudioProcessor:
         voice = voice or KOKORO_VOICE
 
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             def _synthesize():
                 # Generate audio using Kokoro
@@ -296,7 +296,7 @@ class AudioProcessor:
         """
         logger.info("[Audio] Preloading models...")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         # Load both models in parallel using thread pool
         stt_future = loop.run_in_executor(_executor, self._load_stt)
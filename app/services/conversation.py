@@ -127,7 +127,10 @@ class ConversationService:
 
     async def end_session(self, session_id: str):
         """End and cleanup a session."""
+        from app.tools.slot_tools import forget_session
+
         await state_store.delete_session(session_id)
+        forget_session(session_id)
 
     async def process_voice_message(self, session_id: str, user_message: str) -> Dict[str, Any]:
         """
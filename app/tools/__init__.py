@@ -13,7 +13,8 @@ from .slot_tools import (
     set_customer_identified,
     get_todays_date,
     get_pending_updates,
-    clear_pending_updates
+    clear_pending_updates,
+    forget_session
 )
 from .escalation_tools import request_human_agent
 from .call_tools import end_call, get_pending_call_action, clear_pending_call_actions
@@ -63,6 +64,7 @@ __all__ = [
     "get_todays_date",
     "get_pending_updates",
     "clear_pending_updates",
+    "forget_session",
     # Escalation
     "request_human_agent",
     # Call control
@@ -259,12 +259,6 @@ async def book_appointment(
             if inv:
                 vehicle_info = f"{inv.year} {inv.make} {inv.model}"
 
-        # Store confirmation data for state update (via slot_tools pattern)
-        from app.tools.slot_tools import _pending_slot_updates
-        if customer_id not in _pending_slot_updates:
-            # Use a special key pattern for booking confirmations
-            pass  # Will be keyed by session_id in graph
-
         # Build human-readable response
         response = f"BOOKING_CONFIRMED: Appointment #{appointment.id} booked!\n"
         response += f"Type: {appt_type.display_name}\n"
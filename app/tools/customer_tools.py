@@ -84,7 +84,7 @@ async def create_customer(
     vehicle_year: Optional[int] = None
 ) -> str:
     """Create a new customer record. Use after collecting name, phone, and email from a new customer."""
-    from app.tools.slot_tools import _pending_slot_updates
+    from app.tools.slot_tools import mark_customer_identified
 
     async with get_db_context() as session:
         # Check for existing customer
@@ -93,18 +93,11 @@ async def create_customer(
         existing = result.scalar_one_or_none()
 
         if existing:
-            # Auto-set customer as identified
-            if session_id not in _pending_slot_updates:
-                _pending_slot_updates[session_id] = {}
-            _pending_slot_updates[session_id]["_customer_identified"] = True
-            _pending_slot_updates[session_id]["_customer_id"] = existing.id
-            _pending_slot_updates[session_id]["_customer_name"] = existing.name
-            _pending_slot_updates[session_id]["_customer_phone"] = existing.phone
-            _pending_slot_updates[session_id]["_customer_email"] = existing.email
-            # Also update the booking slots with customer info
-            _pending_slot_updates[session_id]["customer_name"] = existing.name
-            _pending_slot_updates[session_id]["customer_phone"] = existing.phone
-            _pending_slot_updates[session_id]["customer_email"] = existing.email
+            # Auto-set customer as identified (and fill booking slots)
+            mark_customer_identified(
+                session_id, existing.id, existing.name,
+                existing.phone, existing.email, fill_slots=True
+            )
             return f"ALREADY_EXISTS: Customer already exists with ID {existing.id}. Using their existing record. Customer is now identified."
 
         # Create customer
@@ -132,17 +125,9 @@ async def create_customer(
         await session.commit()
 
         # Auto-set customer as identified in pending slot updates
-        if session_id not in _pending_slot_updates:
-            _pending_slot_updates[session_id] = {}
-        _pending_slot_updates[session_id]["_customer_identified"] = True
-        _pending_slot_updates[session_id]["_customer_id"] = customer.id
-        _pending_slot_updates[session_id]["_customer_name"] = name
-        _pending_slot_updates[session_id]["_customer_phone"] = phone
-        _pending_slot_updates[session_id]["_customer_email"] = email
-        # Also update the booking slots with customer info
-        _pending_slot_updates[session_id]["customer_name"] = name
-        _pending_slot_updates[session_id]["customer_phone"] = phone
-        _pending_slot_updates[session_id]["customer_email"] = email
+        mark_customer_identified(
+            session_id, customer.id, name, phone, email, fill_slots=True
+        )
 
         response = f"CUSTOMER_CREATED:\n"
         response += f"Customer ID: {customer.id}\n"
@@ -6,25 +6,112 @@ the conversation, rather than relying on regex patterns.
 
 Design:
 - Tools return structured responses (SAVED:, PHONE_INCOMPLETE:, etc.)
-- A global dict (_pending_slot_updates) stores updates by session_id
+- A global dict (_pending_slot_updates) stores a PendingUpdates per session_id
 - The graph's postprocess node reads and clears these updates
 - This pattern allows atomic slot updates without passing state through tools
 
 NOTE: These tools now handle STT normalization automatically.
 Phone numbers with spoken words ("five five five") are converted to digits.
+Emails with spoken separators ("john at gmail dot com") are rewritten.
 """
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from typing import Optional, Literal, Tuple
+from dataclasses import dataclass
 from datetime import date, timedelta
 import re
+import sys
 import logging
 
 logger = logging.getLogger("app.tools.slot_tools")
 
+_VALID_APPT_TYPES = frozenset({"service", "test_drive"})
+
+# Booking slot keys, interned once and shared by every session's updates
+SLOT_FIELDS: Tuple[str, ...] = tuple(sys.intern(k) for k in (
+    "appointment_type",
+    "service_type",
+    "vehicle_interest",
+    "preferred_date",
+    "preferred_time",
+    "customer_name",
+    "customer_phone",
+    "customer_email",
+))
+
+
+@dataclass(slots=True)
+class PendingUpdates:
+    """Slot values and customer identity collected during one agent turn."""
+    appointment_type: Optional[str] = None
+    service_type: Optional[str] = None
+    vehicle_interest: Optional[str] = None
+    preferred_date: Optional[str] = None
+    preferred_time: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_phone: Optional[str] = None
+    customer_email: Optional[str] = None
+    # Customer identification (exposed as "_customer_*" keys)
+    customer_identified: bool = False
+    identified_id: Optional[int] = None
+    identified_name: Optional[str] = None
+    identified_phone: Optional[str] = None
+    identified_email: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Return only the values that were set, in the legacy dict format."""
+        result = {}
+        for key in SLOT_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                result[key] = value
+        if self.customer_identified:
+            result["_customer_identified"] = True
+            result["_customer_id"] = self.identified_id
+            result["_customer_name"] = self.identified_name
+            if self.identified_phone is not None or self.identified_email is not None:
+                result["_customer_phone"] = self.identified_phone
+                result["_customer_email"] = self.identified_email
+        return result
+
+
 # Temporary storage for slot updates during agent execution
 # Keyed by session_id
-_pending_slot_updates: dict = {}
+_pending_slot_updates: dict[str, PendingUpdates] = {}
+
+# Last value broadcast per slot, keyed by session_id. Unlike the pending
+# updates this survives across turns, so a value the LLM re-sends on a
+# confirmation turn is recognized as unchanged.
+_broadcast_slots: dict[str, dict] = {}
+
+# Memoized get_todays_date output: (date, rendered text)
+# The answer only changes when the calendar day rolls over
+_today_cache: Optional[Tuple[date, str]] = None
+
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+# Labels for the next 7 days, indexed by today's weekday()
+_UPCOMING_LABELS = tuple(
+    ("Tomorrow",) + tuple(_WEEKDAYS[(wd + i) % 7] for i in range(2, 8))
+    for wd in range(7)
+)
+
+# Spoken-email tokens collapsed in a single regex pass
+# ("john at gmail dot com" -> "john@gmail.com")
+_EMAIL_TOKEN_MAP = {
+    'at': '@',
+    'dot': '.',
+    'dotcom': '.com',
+    'dot com': '.com',
+}
+# Spoken tokens only count when whitespace-separated (or "dot com" at the
+# end), so text inside an already-written address is never rewritten
+_EMAIL_SUB = re.compile(r'\s+at\s+|\s+dot\s*com(?=\s|$)|\s+dot\s+|\s+')
+# Provider glued to its TLD ("gmailcom") - only fused when no '.' follows the '@'
+_GLUED_DOMAIN = re.compile(r'(gmail|yahoo|hotmail|outlook|icloud)com$')
+# Known providers - used to insert a missing '@' ("johngmail.com")
+_KNOWN_DOMAIN = re.compile(r'(?<!@)(gmail\.com|yahoo\.com|hotmail\.com|outlook\.com|icloud\.com)$')
+# local@domain.tld - one '@', no whitespace, a dot in the domain part
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
 
 
 def normalize_spoken_phone(phone_input: str) -> Tuple[str, bool, str]:
@@ -92,24 +179,72 @@ def normalize_spoken_phone(phone_input: str) -> Tuple[str, bool, str]:
         return "", False, "Could not extract phone digits. Ask customer to say their phone number digit by digit."
 
 
-async def _broadcast_slot_update(session_id: str, slot_name: str, slot_value: str, all_slots: dict):
-    """Push immediate WebSocket update when a slot is filled."""
+def normalize_email(email_input: str) -> str:
+    """
+    Convert a spoken email address to its written form.
+
+    Handles STT transcriptions like:
+    - "john at gmail dot com"
+    - "john.smith at yahoo dotcom"
+    - "johngmailcom" (missing '@' before a known provider)
+
+    Returns:
+        The lowercased, whitespace-free email candidate (not validated)
+    """
+    email = email_input.lower().strip()
+    if _EMAIL_RE.match(email):
+        # Already written out - rewriting could corrupt it ("bob@dotcom.com")
+        return email
+    email = _EMAIL_SUB.sub(
+        lambda m: _EMAIL_TOKEN_MAP.get(' '.join(m.group(0).split()), ''), email
+    )
+    if '.' not in email[email.rfind('@') + 1:]:
+        email = _GLUED_DOMAIN.sub(r'\1.com', email)
+    if '@' not in email:
+        email = _KNOWN_DOMAIN.sub(r'@\1', email)
+    return email
+
+
+# Resolved on first use - app.api imports the agent graph, so a module-level
+# import here would be circular
+_ws_module = None
+
+
+def _get_ws_module():
+    """Return app.api.websocket, importing it only once."""
+    global _ws_module
+    if _ws_module is None:
+        from app.api import websocket
+        _ws_module = websocket
+    return _ws_module
+
+
+async def _broadcast_slot_updates(session_id: str, changed: dict, all_slots: dict):
+    """Push one WebSocket update for all slots filled by a tool call."""
+    try:
+        ws = _get_ws_module()
+        ws_manager = ws.get_ws_manager()
+    except Exception as e:
+        logger.debug(f"[WS] Could not broadcast slot update: {e}")
+        return
+    if not ws_manager:
+        return
+
     try:
-        from app.api.websocket import get_ws_manager
-        ws_manager = get_ws_manager()
-        if ws_manager:
-            message = {
-                "type": "booking_slot_update",
-                "session_id": session_id,
-                "slot_name": slot_name,
-                "slot_value": slot_value,
-                "all_slots": all_slots
-            }
-            # Send to session-specific WebSocket
-            await ws_manager.send_message(session_id, message)
-            # Also send to global dashboard WebSocket for monitoring
-            await ws_manager.broadcast("dashboard", message)
-            logger.info(f"[WS] Broadcast slot update: {slot_name}={slot_value}")
+        message = {
+            "type": "booking_slot_update",
+            "session_id": session_id,
+            "updates": changed,
+            "all_slots": all_slots
+        }
+        # Serialize once for both the session and the dashboard
+        text = ws.dumps_message(message)
+        # Send to session-specific WebSocket
+        await ws_manager.broadcast_text(session_id, text)
+        # Also send to global dashboard WebSocket for monitoring
+        await ws_manager.broadcast_text("dashboard", text)
+        _broadcast_slots.setdefault(session_id, {}).update(changed)
+        logger.info(f"[WS] Broadcast slot update: {changed}")
     except Exception as e:
         # Don't fail if WS not available
         logger.debug(f"[WS] Could not broadcast slot update: {e}")
@@ -146,8 +281,8 @@ class BookingInfoInput(BaseModel):
 
 def get_pending_updates(session_id: str) -> dict:
     """Get and clear pending slot updates for a session."""
-    updates = _pending_slot_updates.pop(session_id, {})
-    return updates
+    updates = _pending_slot_updates.pop(session_id, None)
+    return updates.to_dict() if updates is not None else {}
 
 
 def clear_pending_updates(session_id: str):
@@ -155,6 +290,51 @@ def clear_pending_updates(session_id: str):
     _pending_slot_updates.pop(session_id, None)
 
 
+def forget_session(session_id: str):
+    """Drop all per-session slot state when a session ends."""
+    _pending_slot_updates.pop(session_id, None)
+    _broadcast_slots.pop(session_id, None)
+
+
+def mark_customer_identified(
+    session_id: str,
+    customer_id: int,
+    customer_name: str,
+    customer_phone: Optional[str] = None,
+    customer_email: Optional[str] = None,
+    fill_slots: bool = False
+) -> dict:
+    """
+    Record an identified customer in the pending updates for a session.
+
+    Single write path shared by set_customer_identified and the customer
+    tools, so every caller goes through the same _pending_slot_updates.
+
+    Args:
+        fill_slots: Also copy name/phone/email into the booking slots
+
+    Returns:
+        The session's PendingUpdates
+    """
+    updates = _pending_slot_updates.get(session_id)
+    if updates is None:
+        updates = _pending_slot_updates[session_id] = PendingUpdates()
+    updates.customer_identified = True
+    updates.identified_id = customer_id
+    updates.identified_name = customer_name
+    # Callers like set_customer_identified pass only id/name - keep contact
+    # details already recorded this turn (e.g. by create_customer)
+    if customer_phone is not None:
+        updates.identified_phone = customer_phone
+    if customer_email is not None:
+        updates.identified_email = customer_email
+    if fill_slots:
+        updates.customer_name = customer_name
+        updates.customer_phone = customer_phone
+        updates.customer_email = customer_email
+    return updates
+
+
 @tool(args_schema=BookingInfoInput)
 async def update_booking_info(
     session_id: str,
@@ -169,79 +349,86 @@ async def update_booking_info(
 ) -> str:
     """Save booking information extracted from the conversation. Call immediately when user provides any booking info.
     Phone numbers are automatically normalized from spoken words (e.g., 'five five five' -> '555')."""
-    if session_id not in _pending_slot_updates:
-        _pending_slot_updates[session_id] = {}
-
-    updates = _pending_slot_updates[session_id]
-    saved = []
+    updates = _pending_slot_updates.get(session_id)
+    if updates is None:
+        updates = _pending_slot_updates[session_id] = PendingUpdates()
+    saved: dict = {}  # field -> display value, formatted once at the end
     warnings = []
+    changed = {}  # Broadcast once at the end instead of per field
+    broadcast = _broadcast_slots.setdefault(session_id, {})
+
+    def _set(key: str, value: str):
+        setattr(updates, key, value)
+        # Values already broadcast (e.g. re-sent on confirmation turns) are
+        # not re-broadcast
+        if broadcast.get(key) != value:
+            changed[key] = value
 
     # Process and validate each field
-    if appointment_type and appointment_type.lower() in ["service", "test_drive"]:
-        updates["appointment_type"] = appointment_type.lower()
-        saved.append(f"appointment_type: {appointment_type}")
-        await _broadcast_slot_update(session_id, "appointment_type", appointment_type.lower(), updates)
+    if appointment_type and appointment_type.lower() in _VALID_APPT_TYPES:
+        _set("appointment_type", appointment_type.lower())
+        saved["appointment_type"] = appointment_type
 
     if service_type:
-        updates["service_type"] = service_type
-        saved.append(f"service_type: {service_type}")
-        await _broadcast_slot_update(session_id, "service_type", service_type, updates)
+        _set("service_type", service_type)
+        saved["service_type"] = service_type
 
     if vehicle_interest:
-        updates["vehicle_interest"] = vehicle_interest
-        saved.append(f"vehicle_interest: {vehicle_interest}")
-        await _broadcast_slot_update(session_id, "vehicle_interest", vehicle_interest, updates)
+        _set("vehicle_interest", vehicle_interest)
+        saved["vehicle_interest"] = vehicle_interest
 
     if preferred_date:
         # Validate date format or convert
-        updates["preferred_date"] = preferred_date
-        saved.append(f"preferred_date: {preferred_date}")
-        await _broadcast_slot_update(session_id, "preferred_date", preferred_date, updates)
+        _set("preferred_date", preferred_date)
+        saved["preferred_date"] = preferred_date
 
     if preferred_time:
         # Normalize time format
-        updates["preferred_time"] = preferred_time
-        saved.append(f"preferred_time: {preferred_time}")
-        await _broadcast_slot_update(session_id, "preferred_time", preferred_time, updates)
+        _set("preferred_time", preferred_time)
+        saved["preferred_time"] = preferred_time
 
     if customer_name:
-        updates["customer_name"] = customer_name
-        saved.append(f"customer_name: {customer_name}")
-        await _broadcast_slot_update(session_id, "customer_name", customer_name, updates)
+        _set("customer_name", customer_name)
+        saved["customer_name"] = customer_name
 
     if customer_phone:
         # Use STT-aware phone normalization
         digits, is_valid, message = normalize_spoken_phone(customer_phone)
 
         if is_valid:
-            updates["customer_phone"] = digits
+            _set("customer_phone", digits)
             # Format for display
             if len(digits) == 10:
                 formatted = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
             else:
                 formatted = digits
-            saved.append(f"customer_phone: {formatted}")
-            await _broadcast_slot_update(session_id, "customer_phone", digits, updates)
+            saved["customer_phone"] = formatted
             # Always remind to confirm
             warnings.append(f"CONFIRM_PHONE: {formatted}")
         else:
             # Return message so agent knows to ask for clarification
+            if changed:
+                await _broadcast_slot_updates(session_id, changed, updates.to_dict())
             return f"PHONE_INCOMPLETE: {message}"
 
     if customer_email:
-        # Validate email format - LLM should have already normalized (@ and . present)
-        email = customer_email.lower().strip()
-        # Basic validation - check for @ and .
-        if '@' in email and '.' in email:
-            updates["customer_email"] = email
-            saved.append(f"customer_email: {email}")
-            await _broadcast_slot_update(session_id, "customer_email", email, updates)
+        # Normalize spoken forms ("at", "dot") in case the LLM passed them through
+        email = normalize_email(customer_email)
+        # Basic validation - local@domain.tld
+        if _EMAIL_RE.match(email):
+            _set("customer_email", email)
+            saved["customer_email"] = email
         else:
             # Return validation error so LLM knows to ask user to repeat
+            if changed:
+                await _broadcast_slot_updates(session_id, changed, updates.to_dict())
             return f"VALIDATION_ERROR: Email '{customer_email}' is not valid (needs @ and .). Ask user to repeat clearly."
 
+    if changed:
+        await _broadcast_slot_updates(session_id, changed, updates.to_dict())
+
     if saved:
-        result = f"SAVED: {', '.join(saved)}"
+        result = "SAVED: " + ", ".join(f"{k}: {v}" for k, v in saved.items())
         if warnings:
             result += f"\n{' | '.join(warnings)}"
         return result
@@ -263,12 +450,7 @@ def set_customer_identified(
     customer_name: str
 ) -> str:
     """Mark customer as identified after get_customer returns CUSTOMER_FOUND."""
-    if session_id not in _pending_slot_updates:
-        _pending_slot_updates[session_id] = {}
-
-    _pending_slot_updates[session_id]["_customer_identified"] = True
-    _pending_slot_updates[session_id]["_customer_id"] = customer_id
-    _pending_slot_updates[session_id]["_customer_name"] = customer_name
+    mark_customer_identified(session_id, customer_id, customer_name)
 
     return f"CUSTOMER_SET: Customer {customer_name} (ID: {customer_id}) is now the active customer for this booking."
 
@@ -276,15 +458,16 @@ def set_customer_identified(
 @tool
 def get_todays_date() -> str:
     """Get today's date and upcoming days. Use to convert 'tomorrow', 'next Monday' to YYYY-MM-DD format."""
+    global _today_cache
     today = date.today()
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-
-    result = f"TODAY: {today.strftime('%Y-%m-%d')} ({days[today.weekday()]})\n"
-    result += "UPCOMING:\n"
+    if _today_cache is not None and _today_cache[0] == today:
+        return _today_cache[1]
 
-    for i in range(1, 8):
-        d = today + timedelta(days=i)
-        label = "Tomorrow" if i == 1 else days[d.weekday()]
-        result += f"  {label}: {d.strftime('%Y-%m-%d')}\n"
+    labels = _UPCOMING_LABELS[today.weekday()]
+    lines = [f"TODAY: {today.isoformat()} ({_WEEKDAYS[today.weekday()]})", "UPCOMING:"]
+    for i, label in enumerate(labels, start=1):
+        lines.append(f"  {label}: {(today + timedelta(days=i)).isoformat()}")
 
+    result = "\n".join(lines) + "\n"
+    _today_cache = (today, result)
     return result
@@ -296,7 +296,7 @@ export default function App() {
       case 'booking_slot_update':
         setBookingSlots(prev => ({
           ...prev,
-          [data.slot_name]: data.slot_value,
+          ...data.updates,
           ...data.all_slots
         }))
         setBookingInProgress(true)
@@ -13,20 +13,38 @@ import sys
 import asyncio
 from dotenv import load_dotenv
 
+try:
+    from livekit.api import (
+        LiveKitAPI,
+        CreateSIPInboundTrunkRequest,
+        CreateSIPDispatchRuleRequest,
+        SIPInboundTrunkInfo,
+        SIPDispatchRule,
+        SIPDispatchRuleIndividual,
+        ListSIPInboundTrunkRequest,
+        ListSIPDispatchRuleRequest,
+        DeleteSIPTrunkRequest,
+        DeleteSIPDispatchRuleRequest,
+    )
+except ImportError:
+    LiveKitAPI = None
+
 # Load environment variables
 load_dotenv()
 
 
-async def setup_sip_trunk():
-    """Create SIP inbound trunk and dispatch rules."""
-    try:
-        from livekit.api import LiveKitAPI, CreateSIPInboundTrunkRequest, CreateSIPDispatchRuleRequest
-        from livekit.api import SIPInboundTrunkInfo, SIPDispatchRule, SIPDispatchRuleIndividual
-    except ImportError:
+def _require_livekit_api():
+    """Exit with install instructions if livekit-api is missing."""
+    if LiveKitAPI is None:
         print("ERROR: livekit-api package not installed.")
         print("Install with: pip install livekit-api")
         sys.exit(1)
 
+
+async def setup_sip_trunk():
+    """Create SIP inbound trunk and dispatch rules."""
+    _require_livekit_api()
+
     # Configuration
     api_key = os.getenv("LIVEKIT_API_KEY", "devkey")
     api_secret = os.getenv("LIVEKIT_API_SECRET", "secret")
@@ -113,8 +131,6 @@ async def setup_sip_trunk():
         print("="*50)
 
         try:
-            from livekit.api import ListSIPInboundTrunkRequest, ListSIPDispatchRuleRequest
-
             trunks = await lk.sip.list_sip_inbound_trunk(ListSIPInboundTrunkRequest())
             print(f"\nInbound Trunks ({len(trunks.items)}):")
             for t in trunks.items:
@@ -160,12 +176,7 @@ Next steps:
 
 async def delete_sip_config():
     """Delete all SIP configuration (for cleanup)."""
-    try:
-        from livekit.api import LiveKitAPI, ListSIPInboundTrunkRequest, ListSIPDispatchRuleRequest
-        from livekit.api import DeleteSIPTrunkRequest, DeleteSIPDispatchRuleRequest
-    except ImportError:
-        print("ERROR: livekit-api package not installed.")
-        sys.exit(1)
+    _require_livekit_api()
 
     api_key = os.getenv("LIVEKIT_API_KEY", "devkey")
     api_secret = os.getenv("LIVEKIT_API_SECRET", "secret")
@@ -1,5 +1,5 @@
 from .stt import stt, SpeechToText
-from .tts_kokoro import kokoro_tts_instance as tts, KokoroTextToSpeech as TextToSpeech
+from .tts_kokoro import get_kokoro_tts, KokoroTextToSpeech as TextToSpeech
 from .agent import DealershipVoiceAgent, create_agent
 from .config import get_voice_settings
 
@@ -7,8 +7,17 @@ __all__ = [
     "stt",
     "SpeechToText",
     "tts",
+    "get_kokoro_tts",
     "TextToSpeech",
     "DealershipVoiceAgent",
     "create_agent",
     "get_voice_settings",
 ]
+
+
+def __getattr__(name):
+    # Backward-compatible `from voice_worker import tts`; the instance is
+    # only created on first access
+    if name == "tts":
+        return get_kokoro_tts()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,17 @@
+"""
+Shared thread pool for blocking model work (Whisper STT, Kokoro TTS).
+
+One pool per worker process instead of one per module. Sized by
+settings.voice_workers (default two threads, so a barge-in transcription
+never queues behind a TTS producer that is still finishing its current
+segment).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import get_voice_settings
+
+VOICE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, get_voice_settings().voice_workers),
+    thread_name_prefix="voice",
+)
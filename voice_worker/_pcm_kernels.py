@@ -0,0 +1,59 @@
+"""
+PCM conversion kernels.
+
+Single-pass float32 -> int16 (scale, clip, store) for TTS output. Compiled
+with Numba when it is installed; otherwise falls back to NumPy.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+def _f32_to_pcm16_numpy(src: np.ndarray, dst: np.ndarray):
+    """Scale float32 [-1, 1] to int16 with clipping (one float temporary)."""
+    tmp = np.multiply(src, np.float32(32767.0), dtype=np.float32)
+    np.clip(tmp, -32768.0, 32767.0, out=tmp)
+    dst[:] = tmp
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False, nogil=True)
+    def _f32_to_pcm16_jit(src, dst):
+        for i in range(src.shape[0]):
+            v = src[i] * np.float32(32767.0)
+            if v < -32768.0:
+                v = -32768.0
+            elif v > 32767.0:
+                v = 32767.0
+            dst[i] = np.int16(v)
+
+    _f32_to_pcm16_impl = _f32_to_pcm16_jit
+else:
+    _f32_to_pcm16_impl = _f32_to_pcm16_numpy
+
+
+def f32_to_pcm16(src: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert float32 audio in [-1, 1] to int16 PCM.
+
+    Out-of-range samples are clipped instead of wrapping around. Writes into
+    dst when given (must hold at least src.size samples) and returns the
+    filled int16 view.
+    """
+    src = np.ascontiguousarray(src, dtype=np.float32).reshape(-1)
+    if dst is None:
+        dst = np.empty(src.shape[0], dtype=np.int16)
+    out = dst[:src.shape[0]]
+    _f32_to_pcm16_impl(src, out)
+    return out
+
+
+def warmup():
+    """Trigger JIT compilation so the first real synthesis doesn't pay for it."""
+    f32_to_pcm16(np.zeros(240, dtype=np.float32))
@@ -0,0 +1,46 @@
+"""
+VAD energy kernels.
+
+Single-pass sum-of-squares over int16 PCM with no temporaries. Compiled
+with Numba when it is installed; otherwise falls back to NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+def _sum_squares_i16_numpy(a: np.ndarray) -> int:
+    """Sum of squared samples (int64 accumulation)."""
+    samples = a.astype(np.int64)
+    return int(np.dot(samples, samples))
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def _sum_squares_i16_jit(a):
+        acc = 0
+        for i in range(a.shape[0]):
+            v = np.int64(a[i])
+            acc += v * v
+        return acc
+
+    def sum_squares_i16(a: np.ndarray) -> int:
+        """Sum of squared samples (int64 accumulation)."""
+        return int(_sum_squares_i16_jit(a))
+else:
+    sum_squares_i16 = _sum_squares_i16_numpy
+
+
+def sum_squares_i16_rows(batch: np.ndarray) -> np.ndarray:
+    """Per-row sum of squared samples for a (frames, samples) int16 batch."""
+    samples = batch.astype(np.int64)
+    return np.einsum('ij,ij->i', samples, samples)
+
+
+def warmup():
+    """Trigger JIT compilation so the first real frame doesn't pay for it."""
+    sum_squares_i16(np.zeros(960, dtype=np.int16))
@@ -1,23 +1,30 @@
 import asyncio
+import contextlib
 import httpx
-import io
 import json
 import logging
-import wave
+import math
 import numpy as np
+import re
+import soxr
 import time
-from datetime import datetime
-from typing import Optional, Set
+from typing import List, Optional, Set
 
 import websockets
 from livekit import rtc
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 from .stt import stt
 from .config import get_voice_settings
+from . import _pcm_kernels, _vad_kernels
 
 # Kokoro TTS
 settings = get_voice_settings()
-from .tts_kokoro import kokoro_tts_instance as tts
+from .tts_kokoro import get_kokoro_tts
 
 logger = logging.getLogger("voice_worker.agent")
 
@@ -25,7 +32,51 @@ logger = logging.getLogger("voice_worker.agent")
 SAMPLE_RATE = 48000  # LiveKit default
 CHANNELS = 1
 BYTES_PER_SAMPLE = 2  # 16-bit audio
+FRAME_SAMPLES = SAMPLE_RATE // 100  # 10ms output frames (required for direct capture)
+FRAME_DURATION_S = FRAME_SAMPLES / SAMPLE_RATE
+INT16_SCALE = 1.0 / 32768.0  # int16 sample -> [-1, 1)
 WHISPER_SAMPLE_RATE = 16000  # Whisper expects 16kHz
+FRAME_QUEUE_SIZE = 50  # Incoming frames buffered ahead of VAD (~0.5s of 10ms frames)
+VAD_BATCH_FRAMES = 10  # Max queued frames whose energy is computed in one pass
+VAD_PEAK_DECAY = 0.995  # Per-frame decay of the tracked peak energy
+VAD_NOISE_ADAPT = 0.05  # Noise floor rise rate for frames within the noise band
+VAD_NOISE_ADAPT_SLOW = 0.0005  # ... and for louder frames (tracks a step in room noise)
+UTTERANCE_QUEUE_SIZE = 2  # Finished utterances waiting for STT (oldest dropped)
+
+# Settings resolved once at import; these never change for the worker's lifetime
+APP_API_URL = settings.app_api_url
+WS_URL_BASE = APP_API_URL.replace("http://", "ws://").replace("https://", "wss://")
+MAX_SPEECH_BYTES = settings.max_speech_duration_s * SAMPLE_RATE * BYTES_PER_SAMPLE
+
+# WebSocket notification decoding; the keep-alive ping never changes
+_ws_loads = orjson.loads if orjson is not None else json.loads
+_WS_PING = json.dumps({"type": "ping"})
+
+# Whisper hallucinations (common patterns when audio is unclear)
+# Only filter EXACT matches for short text, use substring match for longer phrases
+_EXACT_HALLUCINATIONS = frozenset({
+    # Single words/sounds that are pure noise
+    "...", "___", "you", "the", "a", "i",
+    # Foreign language artifacts (often appear in noisy audio)
+    "字幕", "視聴", "請訂閱", "谢谢",
+})
+
+# Multi-word Whisper hallucinations, matched in a single regex pass
+_PHRASE_HALLUCINATION_RE = re.compile("|".join(re.escape(p) for p in (
+    "thank you for watching",
+    "please subscribe",
+    "thanks for watching",
+    "see you next time",
+    "music playing",
+    "[music]",
+    "[silence]",
+    "[applause]",
+    "[laughter]",
+    "you may as well",
+)))
+
+# Any letter or digit (\w minus underscore)
+_ALNUM_RE = re.compile(r"[^\W_]")
 
 
 class DealershipVoiceAgent:
@@ -44,30 +95,63 @@ class DealershipVoiceAgent:
 
         # Audio processing state
         self.is_speaking = False
-        self.speech_buffer: list[bytes] = []
+        self._speak_lock = asyncio.Lock()  # Prevents overlapping speech
+        self._speech_done = asyncio.Event()  # Set whenever the agent is not speaking
+        self._play_deadline = 0.0  # loop.time() at which the next output frame is due
+        self._speech_done.set()
+        # Preallocated int16 PCM buffer for the current utterance (+ write cursor)
+        self._speech_buf = bytearray(MAX_SPEECH_BYTES)
+        self._speech_len = 0
+        self._speech_ssq = 0  # Sum-of-squares of the buffered samples
+        self._speech_committed = 0  # Bytes already sent for early STT at a pause
+        self._partial_stt: List[asyncio.Task] = []  # Early transcripts, in order
         self.is_user_speaking = False
-        self.silence_frames = 0
-        self.speech_frames = 0
 
         # Barge-in (user interruption) support
         self._interrupt_speaking = False
-        self._barge_in_frames = 0  # Count frames of speech during agent talking
 
-        # VAD settings (tuned for natural speech with pauses)
-        self.vad_threshold = 0.012  # Energy threshold for speech detection (lowered)
+        # VAD settings (tuned for natural speech with pauses); LiveKit
+        # delivers 10ms frames, so frame counts below are in 10ms units
+        # Adaptive energy threshold: max(noise floor * vad_noise_ratio,
+        # min(recent speech peak * vad_peak_ratio, noise floor * vad_peak_cap_ratio),
+        # vad_threshold) in RMS terms
+        self.vad_threshold = 0.004  # Absolute minimum RMS for speech
+        self.vad_noise_ratio = 3.0
+        self.vad_peak_ratio = 0.4
+        self.vad_peak_cap_ratio = 6.0  # A cough/shout can't lift the threshold past this
         self.min_speech_frames = 5  # Min frames to consider as speech
-        self.min_silence_frames = 60  # Frames of silence to end speech (~1.2 seconds)
-        self.barge_in_frames = 8  # Frames needed to trigger barge-in (~160ms of speech)
+        self.min_silence_frames = 60  # Frames of silence to end speech (~0.6 seconds)
+        self.barge_in_frames = 8  # Frames needed to trigger barge-in (~80ms of speech)
+        # Mid-utterance pause that starts transcribing the speech so far
+        # (~300ms - shorter pauses are ordinary gaps between phrases)
+        self.partial_silence_frames = 30
+        self.min_partial_seconds = 1.0  # Min new audio before an early transcription
+        # Tracked in int16 mean-square units (no sqrt per frame), so the RMS
+        # ratios above are squared
+        self._vad_min_ms = (self.vad_threshold * 32768.0) ** 2
+        self._vad_noise_factor = self.vad_noise_ratio ** 2
+        self._vad_peak_factor = self.vad_peak_ratio ** 2
+        self._vad_peak_cap_factor = self.vad_peak_cap_ratio ** 2
+        self._vad_noise_ms = self._vad_min_ms
+        self._vad_peak_ms = 0.0
+        # Speech/silence decision for each of the last min_silence_frames frames
+        # (newest in bit 0); counts come from masks and popcount, not counters
+        self._vad_bits = 0
+        self._vad_window_mask = (1 << self.min_silence_frames) - 1
+        self._barge_in_mask = (1 << self.barge_in_frames) - 1
+        self._partial_mask = (1 << self.partial_silence_frames) - 1
 
         # State management
         self._running = False
         self._audio_streams: Set[rtc.AudioStream] = set()
         self._audio_tasks: Set[asyncio.Task] = set()
         self._ws_task: Optional[asyncio.Task] = None
+        # Finished utterances, handed from VAD to a single STT consumer
+        self._utterance_queue: asyncio.Queue = asyncio.Queue(maxsize=UTTERANCE_QUEUE_SIZE)
 
         # Idle mode state (when human joins conference)
         self.is_idle = False
-        self._idle_entered_at: Optional[datetime] = None
+        self._idle_entered_at: Optional[float] = None  # time.monotonic()
         self._human_participants: Set[str] = set()
         self._idle_task: Optional[asyncio.Task] = None
         self._idle_transition_pending = False  # Prevent race conditions during idle transition
@@ -79,16 +163,31 @@ class DealershipVoiceAgent:
 
     async def initialize(self):
         """Initialize the agent."""
-        # Models may already be preloaded, but ensure they're ready
+        # Models may already be preloaded, but ensure they're ready.
+        # Load off the event loop and in parallel with the HTTP client setup.
+        warmups = []
+        tts = get_kokoro_tts()
         if not stt._loaded:
-            stt.load_model()
+            warmups.append(asyncio.to_thread(stt.load_model))
         if not tts._loaded:
-            tts.load_model()
+            warmups.append(asyncio.to_thread(tts.load_model))
+        # Compile the VAD and PCM kernels before the first audio frame arrives
+        warmups.append(asyncio.to_thread(_vad_kernels.warmup))
+        warmups.append(asyncio.to_thread(_pcm_kernels.warmup))
+        warmup_task = asyncio.gather(*warmups)
 
         self.http_client = httpx.AsyncClient(
-            base_url=settings.app_api_url,
-            timeout=60.0  # Increased timeout for LLM responses
+            base_url=APP_API_URL,
+            # Long read timeout for LLM responses, fail fast if the app is down
+            timeout=httpx.Timeout(60.0, connect=2.0),
+            # Keep connections to the app warm across turns of a call
+            limits=httpx.Limits(
+                max_keepalive_connections=8,
+                max_connections=16,
+                keepalive_expiry=300.0
+            )
         )
+        await warmup_task
         logger.info("Voice agent initialized")
 
     def stop(self):
@@ -138,6 +237,22 @@ class DealershipVoiceAgent:
 
         logger.info("Voice agent cleaned up")
 
+    def _post_in_background(self, path: str, payload: dict, description: str):
+        """
+        Fire a non-critical POST to the app without blocking the caller.
+
+        The task is tracked in _audio_tasks so cleanup() can cancel it.
+        """
+        async def _post():
+            try:
+                await self.http_client.post(path, json=payload)
+            except Exception as e:
+                logger.warning(f"Failed to {description}: {e}")
+
+        task = asyncio.create_task(_post())
+        self._audio_tasks.add(task)
+        task.add_done_callback(self._audio_tasks.discard)
+
     async def enter_idle_mode(self, delay_seconds: float = None):
         """
         Enter idle mode after delay.
@@ -179,31 +294,28 @@ class DealershipVoiceAgent:
             return
 
         # Clear any buffered audio to prevent stale speech from being processed
-        if self.speech_buffer:
+        if self._speech_len:
             logger.info("Clearing speech buffer before entering idle mode")
-            self.speech_buffer = []
+            self._speech_len = 0
         self.is_user_speaking = False
-        self.speech_frames = 0
-        self.silence_frames = 0
+        self._vad_bits = 0
 
         self.is_idle = True
-        self._idle_entered_at = datetime.utcnow()
+        self._idle_entered_at = time.monotonic()
         self._idle_transition_pending = False
         logger.info("🔇 Agent entered IDLE MODE - stopped listening while human is present")
 
         # Notify backend/frontend about idle state
-        try:
-            await self.http_client.post(
-                "/api/agent-status",
-                json={
-                    "session_id": self.session_id,
-                    "status": "idle",
-                    "reason": "human_joined",
-                    "human_participants": list(self._human_participants)
-                }
-            )
-        except Exception as e:
-            logger.warning(f"Failed to notify backend of idle state: {e}")
+        self._post_in_background(
+            "/api/agent-status",
+            {
+                "session_id": self.session_id,
+                "status": "idle",
+                "reason": "human_joined",
+                "human_participants": list(self._human_participants)
+            },
+            "notify backend of idle state"
+        )
 
     async def exit_idle_mode(self, speak_resume: bool = True):
         """
@@ -218,30 +330,27 @@ class DealershipVoiceAgent:
         self._idle_transition_pending = False
         idle_duration = None
         if self._idle_entered_at:
-            idle_duration = (datetime.utcnow() - self._idle_entered_at).total_seconds()
+            idle_duration = time.monotonic() - self._idle_entered_at
         self._idle_entered_at = None
 
         # Reset audio state for clean resumption
-        self.speech_buffer = []
+        self._speech_len = 0
         self.is_user_speaking = False
-        self.speech_frames = 0
-        self.silence_frames = 0
+        self._vad_bits = 0
 
         logger.info(f"🔊 Agent exited IDLE MODE - resuming normal operation (was idle for {idle_duration:.1f}s)" if idle_duration else "🔊 Agent exited IDLE MODE")
 
         # Notify backend/frontend about active state
-        try:
-            await self.http_client.post(
-                "/api/agent-status",
-                json={
-                    "session_id": self.session_id,
-                    "status": "active",
-                    "reason": "human_left",
-                    "idle_duration_seconds": idle_duration
-                }
-            )
-        except Exception as e:
-            logger.warning(f"Failed to notify backend of active state: {e}")
+        self._post_in_background(
+            "/api/agent-status",
+            {
+                "session_id": self.session_id,
+                "status": "active",
+                "reason": "human_left",
+                "idle_duration_seconds": idle_duration
+            },
+            "notify backend of active state"
+        )
 
         # Let agent generate resume message - no hardcoded message
         if speak_resume:
@@ -385,6 +494,11 @@ class DealershipVoiceAgent:
 
         logger.info(f"Agent running in room: {self.session_id}")
 
+        # Process finished utterances in order, one at a time
+        stt_consumer = asyncio.create_task(self._consume_utterances())
+        self._audio_tasks.add(stt_consumer)
+        stt_consumer.add_done_callback(self._audio_tasks.discard)
+
         # Create session in app backend
         try:
             response = await self.http_client.post(
@@ -397,7 +511,9 @@ class DealershipVoiceAgent:
             logger.error(f"Failed to create session: {e}")
 
         # Set up audio source for TTS output
-        self.audio_source = rtc.AudioSource(SAMPLE_RATE, CHANNELS)
+        # queue_size_ms=0: no SDK-side buffering, so capture_frame must be
+        # called in real time with 10ms frames - _play_pcm paces its output
+        self.audio_source = rtc.AudioSource(SAMPLE_RATE, CHANNELS, queue_size_ms=0)
         track = rtc.LocalAudioTrack.create_audio_track("agent-voice", self.audio_source)
 
         options = rtc.TrackPublishOptions()
@@ -434,22 +550,22 @@ class DealershipVoiceAgent:
 
     async def _listen_for_notifications(self):
         """Listen for real-time notifications via WebSocket."""
-        # Build WebSocket URL from HTTP URL
-        ws_url = settings.app_api_url.replace("http://", "ws://").replace("https://", "wss://")
-        ws_url = f"{ws_url}/ws/{self.session_id}"
+        ws_url = f"{WS_URL_BASE}/ws/{self.session_id}"
 
         logger.info(f"Connecting to WebSocket for notifications: {ws_url}")
 
         while self._running:
             try:
-                async with websockets.connect(ws_url) as ws:
+                # Skip permessage-deflate - inflating every broadcast costs more
+                # than the bytes it saves on this local link
+                async with websockets.connect(ws_url, compression=None) as ws:
                     logger.info("WebSocket connected for notifications")
 
                     while self._running:
                         try:
                             # Wait for message with timeout
                             message = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                            data = json.loads(message)
+                            data = _ws_loads(message)
 
                             # Handle notification messages
                             if data.get("type") == "notification":
@@ -467,10 +583,7 @@ class DealershipVoiceAgent:
                                 # Wait for any current speech to finish first
                                 if self.is_speaking:
                                     logger.info("Waiting for current speech to finish before farewell...")
-                                    for _ in range(200):  # Wait up to 4 seconds
-                                        if not self.is_speaking:
-                                            break
-                                        await asyncio.sleep(0.02)
+                                    await self._wait_for_speech_done(4.0)
 
                                 # Speak the farewell message (agent response should be empty/minimal)
                                 if farewell and farewell.strip():
@@ -478,11 +591,7 @@ class DealershipVoiceAgent:
                                     await self.speak(farewell)
 
                                     # Wait for farewell to finish
-                                    if self.is_speaking:
-                                        for _ in range(300):  # Wait up to 6 seconds for farewell
-                                            if not self.is_speaking:
-                                                break
-                                            await asyncio.sleep(0.02)
+                                    await self._wait_for_speech_done(6.0)
 
                                 # Small delay to ensure audio is fully delivered
                                 await asyncio.sleep(0.5)
@@ -494,7 +603,7 @@ class DealershipVoiceAgent:
 
                             # Handle heartbeat
                             elif data.get("type") == "heartbeat":
-                                await ws.send(json.dumps({"type": "ping"}))
+                                await ws.send(_WS_PING)
 
                             # Handle human joined signal (from backend - this is a PENDING join)
                             # The human hasn't actually joined LiveKit yet, this is advance notice
@@ -538,7 +647,7 @@ class DealershipVoiceAgent:
                         except asyncio.TimeoutError:
                             # Send ping to keep connection alive
                             try:
-                                await ws.send(json.dumps({"type": "ping"}))
+                                await ws.send(_WS_PING)
                             except Exception:
                                 break
 
@@ -563,13 +672,23 @@ class DealershipVoiceAgent:
         audio_stream = rtc.AudioStream(track)
         self._audio_streams.add(audio_stream)
 
+        # Decouple frame ingress from VAD: if VAD falls behind, drop the
+        # oldest frames instead of letting LiveKit's queue back up
+        frame_queue: asyncio.Queue = asyncio.Queue(maxsize=FRAME_QUEUE_SIZE)
+        consumer = asyncio.create_task(self._consume_audio_frames(frame_queue))
+        self._audio_tasks.add(consumer)
+        consumer.add_done_callback(self._audio_tasks.discard)
+
         try:
             async for frame_event in audio_stream:
                 if not self._running:
                     break
 
-                frame = frame_event.frame
-                await self._process_audio_frame(frame)
+                try:
+                    frame_queue.put_nowait(frame_event.frame)
+                except asyncio.QueueFull:
+                    frame_queue.get_nowait()
+                    frame_queue.put_nowait(frame_event.frame)
 
         except asyncio.CancelledError:
             logger.info("Audio processing cancelled")
@@ -577,6 +696,7 @@ class DealershipVoiceAgent:
             logger.error(f"Error processing audio track: {e}", exc_info=True)
         finally:
             # Cleanup
+            consumer.cancel()
             self._audio_streams.discard(audio_stream)
             try:
                 await audio_stream.aclose()
@@ -584,169 +704,304 @@ class DealershipVoiceAgent:
                 pass
             logger.info(f"Audio processing ended for track: {track.sid}")
 
-    async def _process_audio_frame(self, frame: rtc.AudioFrame):
-        """Process a single audio frame for VAD."""
+    async def _consume_audio_frames(self, frame_queue: asyncio.Queue):
+        """
+        Run VAD over frames queued by process_audio_track.
+
+        Not gated on _running: the track can be subscribed before run()
+        starts the agent. process_audio_track cancels this task when the
+        track ends.
+        """
+        while True:
+            frames = [await frame_queue.get()]
+            # Batch whatever is already queued (never wait for more - that
+            # would delay barge-in) so energies come from one vectorized pass
+            while len(frames) < VAD_BATCH_FRAMES and not frame_queue.empty():
+                frames.append(frame_queue.get_nowait())
+
+            try:
+                if len(frames) == 1:
+                    await self._process_audio_frame(frames[0])
+                    continue
+
+                sizes = {len(f.data) for f in frames}
+                ssqs = None
+                if len(sizes) == 1 and not (self.is_idle or self._idle_transition_pending):
+                    batch = np.stack([np.frombuffer(f.data, dtype=np.int16) for f in frames])
+                    ssqs = _vad_kernels.sum_squares_i16_rows(batch)
+                for i, frame in enumerate(frames):
+                    await self._process_audio_frame(
+                        frame, int(ssqs[i]) if ssqs is not None else None
+                    )
+            except Exception as e:
+                logger.error(f"Error processing audio frame: {e}", exc_info=True)
+
+    async def _process_audio_frame(self, frame: rtc.AudioFrame, ssq: Optional[int] = None):
+        """
+        Process a single audio frame for VAD.
+
+        Args:
+            frame: Incoming audio frame
+            ssq: Precomputed sum-of-squares of the frame's samples (batched path)
+        """
         # Skip processing while in idle mode or transitioning to idle
         # (human is handling the conversation)
         if self.is_idle or self._idle_transition_pending:
             # Clear any buffered speech to prevent stale audio from being processed
-            if self.speech_buffer:
+            if self._speech_len:
                 logger.debug("Clearing speech buffer due to idle mode")
-                self.speech_buffer = []
+                self._speech_len = 0
                 self.is_user_speaking = False
-                self.speech_frames = 0
+                self._vad_bits = 0
             return
 
-        audio_data = np.frombuffer(frame.data, dtype=np.int16)
-
-        # Calculate RMS energy (normalized)
-        energy = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2)) / 32768.0
+        n_samples = frame.samples_per_channel * frame.num_channels
+
+        # Integer sum-of-squares vs. precomputed threshold (no sqrt/normalize per frame).
+        # The batched path already has ssq, so only wrap the buffer when needed.
+        if ssq is None:
+            ssq = _vad_kernels.sum_squares_i16(np.frombuffer(frame.data, dtype=np.int16))
+
+        # Speech if the frame clears the noise floor, a fraction of the recent
+        # speech peak (capped relative to the noise floor, so one loud
+        # transient can't mute softer speech after it) and the absolute minimum
+        ms = ssq / n_samples
+        self._vad_peak_ms *= VAD_PEAK_DECAY
+        is_speech = ms > max(
+            self._vad_noise_ms * self._vad_noise_factor,
+            min(
+                self._vad_peak_ms * self._vad_peak_factor,
+                self._vad_noise_ms * self._vad_peak_cap_factor,
+            ),
+            self._vad_min_ms,
+        )
+        # Only frames already classed as speech feed the peak
+        if is_speech and ms > self._vad_peak_ms:
+            self._vad_peak_ms = ms
+        # Noise floor drops immediately and rises slowly, very slowly on
+        # frames well above it so speech doesn't drag it up
+        if ms < self._vad_noise_ms:
+            self._vad_noise_ms = ms
+        elif ms <= self._vad_noise_ms * self._vad_noise_factor:
+            self._vad_noise_ms += (ms - self._vad_noise_ms) * VAD_NOISE_ADAPT
+        else:
+            self._vad_noise_ms += (ms - self._vad_noise_ms) * VAD_NOISE_ADAPT_SLOW
 
-        if energy > self.vad_threshold:
-            self.speech_frames += 1
-            self.silence_frames = 0
+        # Shift this frame's decision into the VAD history
+        bits = ((self._vad_bits << 1) | is_speech) & self._vad_window_mask
+        self._vad_bits = bits
 
+        if is_speech:
             # Barge-in detection: if agent is speaking and user talks over
             if self.is_speaking:
-                self._barge_in_frames += 1
-                if self._barge_in_frames >= self.barge_in_frames:
-                    if not self._interrupt_speaking:  # Only log once
-                        logger.info(f"🛑 BARGE-IN detected! User interrupting agent (energy: {energy:.4f})")
+                # Last barge_in_frames frames were all speech
+                if (bits & self._barge_in_mask) == self._barge_in_mask and not self._interrupt_speaking:
+                    energy = math.sqrt(ms) * INT16_SCALE
+                    logger.info(f"🛑 BARGE-IN detected! User interrupting agent (energy: {energy:.4f})")
                     self._interrupt_speaking = True
                 # Buffer the audio even during barge-in
                 if not self.is_user_speaking:
                     self.is_user_speaking = True
-                    self.speech_buffer = []
-                self.speech_buffer.append(frame.data)
+                    self._speech_len = 0
+                self._buffer_speech(frame, ssq)
                 return  # Skip normal VAD processing while agent is stopping
 
-            if self.speech_frames >= self.min_speech_frames:
-                if not self.is_user_speaking:
-                    self.is_user_speaking = True
-                    self.speech_buffer = []
-                    logger.info(f"User started speaking (energy: {energy:.4f})")
+            if not self.is_user_speaking and bits.bit_count() >= self.min_speech_frames:
+                self.is_user_speaking = True
+                self._speech_len = 0
+                energy = math.sqrt(ms) * INT16_SCALE
+                logger.info(f"User started speaking (energy: {energy:.4f})")
 
+            if self.is_user_speaking:
                 # Buffer the audio
-                self.speech_buffer.append(frame.data)
-        else:
-            self.silence_frames += 1
-            self._barge_in_frames = 0  # Reset barge-in counter on silence
+                self._buffer_speech(frame, ssq)
+        elif self.is_user_speaking:
+            # Still buffer during short silences
+            self._buffer_speech(frame, ssq)
 
-            if self.is_user_speaking:
-                # Still buffer during short silences
-                self.speech_buffer.append(frame.data)
-
-                if self.silence_frames >= self.min_silence_frames:
-                    # End of speech detected
-                    self.is_user_speaking = False
-                    self.speech_frames = 0
-                    logger.info("User stopped speaking")
-
-                    # Process the buffered speech
-                    if self.speech_buffer:
-                        audio_bytes = b''.join(self.speech_buffer)
-                        self.speech_buffer = []
-
-                        # Create task and track it
-                        task = asyncio.create_task(
-                            self._handle_user_speech(audio_bytes, frame.sample_rate)
-                        )
-                        self._audio_tasks.add(task)
-                        task.add_done_callback(self._audio_tasks.discard)
-
-    async def _handle_user_speech(self, audio_data: bytes, sample_rate: int):
-        """Process user speech through STT and get response with latency tracking."""
+            if not bits:
+                # End of speech detected (a full window of silence)
+                self.is_user_speaking = False
+                logger.info("User stopped speaking")
+
+                # Process the buffered speech
+                self._flush_speech(frame.sample_rate)
+            elif not bits & self._partial_mask:
+                # Mid-utterance pause - start on what we have so far
+                self._transcribe_early(frame.sample_rate)
+
+    def _buffer_speech(self, frame: rtc.AudioFrame, ssq: int):
+        """Copy a frame into the preallocated utterance buffer."""
+        data = memoryview(frame.data).cast("B")
+        end = self._speech_len + len(data)
+        if end > len(self._speech_buf):
+            # Hit max_speech_duration_s - process what we have and keep listening
+            logger.info("Max speech duration reached, processing utterance")
+            self._flush_speech(frame.sample_rate)
+            end = len(data)
+        if end == len(data):
+            # First frame of a new utterance; early transcripts left over
+            # from a discarded one (e.g. idle mode) are stale
+            self._speech_ssq = 0
+            self._speech_committed = 0
+            self._cancel_partials(self._partial_stt)
+            self._partial_stt = []
+        self._speech_buf[end - len(data):end] = data
+        self._speech_len = end
+        # Running sum-of-squares so the utterance RMS needs no second pass
+        self._speech_ssq += ssq
+
+    def _flush_speech(self, sample_rate: int):
+        """Hand the buffered utterance to STT and reset the write cursor."""
+        if not self._speech_len:
+            return
+
+        # Copy out only the not-yet-transcribed region; the buffer itself is
+        # reused. Earlier parts are already in flight as _partial_stt.
+        utterance = (
+            bytes(memoryview(self._speech_buf)[self._speech_committed:self._speech_len]),
+            sample_rate,
+            self._speech_ssq,
+            self._speech_len // BYTES_PER_SAMPLE,
+            self._partial_stt,
+        )
+        self._speech_len = 0
+        self._speech_committed = 0
+        self._partial_stt = []
+
+        # If STT can't keep up, drop the oldest pending utterance
+        try:
+            self._utterance_queue.put_nowait(utterance)
+        except asyncio.QueueFull:
+            dropped = self._utterance_queue.get_nowait()
+            self._cancel_partials(dropped[-1])
+            logger.warning("STT backlog full, dropping oldest utterance")
+            self._utterance_queue.put_nowait(utterance)
+
+    def _transcribe_early(self, sample_rate: int):
+        """Start STT on speech buffered since the last pause, while the user may keep talking."""
+        pending = self._speech_len - self._speech_committed
+        if pending < self.min_partial_seconds * sample_rate * BYTES_PER_SAMPLE:
+            return
+
+        audio_bytes = bytes(memoryview(self._speech_buf)[self._speech_committed:self._speech_len])
+        self._speech_committed = self._speech_len
+
+        task = asyncio.create_task(self._transcribe_segment(audio_bytes, sample_rate))
+        self._audio_tasks.add(task)
+        task.add_done_callback(self._audio_tasks.discard)
+        self._partial_stt.append(task)
+        logger.info(f"Early transcription started ({pending // BYTES_PER_SAMPLE} samples)")
+
+    async def _transcribe_segment(self, audio_data: bytes, sample_rate: int) -> str:
+        """Resample (off the event loop) and transcribe one piece of an utterance."""
+        audio_np = await asyncio.to_thread(self._prepare_audio, audio_data, sample_rate)
+        return await stt.transcribe_async(audio_np, WHISPER_SAMPLE_RATE)
+
+    @staticmethod
+    def _cancel_partials(partials: List[asyncio.Task]):
+        """Cancel early transcriptions whose utterance was discarded."""
+        for task in partials:
+            task.cancel()
+
+    async def _consume_utterances(self):
+        """Run STT -> LLM -> TTS for utterances queued by _flush_speech."""
+        while self._running:
+            audio_bytes, sample_rate, ssq, n_samples, partials = await self._utterance_queue.get()
+            try:
+                await self._handle_user_speech(audio_bytes, sample_rate, ssq, n_samples, partials)
+            except Exception as e:
+                logger.error(f"Error handling user speech: {e}", exc_info=True)
+            finally:
+                # No-op unless the utterance was rejected before its partials finished
+                self._cancel_partials(partials)
+
+    @staticmethod
+    def _prepare_audio(audio_data: bytes, sample_rate: int) -> np.ndarray:
+        """
+        Convert and resample int16 PCM for Whisper (runs in a worker thread).
+
+        Returns:
+            float32 PCM in [-1, 1) at WHISPER_SAMPLE_RATE
+        """
+        # Convert raw bytes to numpy array
+        audio_np = np.frombuffer(audio_data, dtype=np.int16)
+
+        # Whisper's native input format, converted once here rather than inside STT
+        audio_f32 = audio_np.astype(np.float32)
+        audio_f32 *= INT16_SCALE
+
+        # Resample if needed (48kHz -> 16kHz for Whisper)
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            # Polyphase resample with a proper anti-alias filter (float32 in, float32 out)
+            audio_f32 = soxr.resample(audio_f32, sample_rate, WHISPER_SAMPLE_RATE, quality='HQ')
+
+        return audio_f32
+
+    async def _handle_user_speech(
+        self,
+        audio_data: bytes,
+        sample_rate: int,
+        ssq: int,
+        n_samples: int,
+        partials: List[asyncio.Task]
+    ):
+        """
+        Process user speech through STT and get response with latency tracking.
+
+        Args:
+            audio_data: int16 PCM not covered by partials (the utterance tail)
+            sample_rate: Sample rate of audio_data
+            ssq: Sum-of-squares of the whole utterance, accumulated during VAD
+            n_samples: Sample count of the whole utterance
+            partials: Early transcriptions of the utterance's start, in order
+        """
         # Check if we should process this audio (might have entered idle mode while audio was in flight)
         if self.is_idle or self._idle_transition_pending:
             logger.info("Skipping user speech processing - agent is idle or entering idle mode")
             return
 
-        total_start = time.time()
+        total_start = time.monotonic_ns()
         latency = {}
 
         # Wait briefly for any barge-in to complete stopping the agent
         if self.is_speaking:
             logger.info("Waiting for agent to stop speaking after barge-in...")
-            for _ in range(20):  # Wait up to 400ms
-                if not self.is_speaking:
-                    break
-                await asyncio.sleep(0.02)
-
-        # Convert raw bytes to numpy array
-        audio_np = np.frombuffer(audio_data, dtype=np.int16)
+            await self._wait_for_speech_done(0.4)
 
         # Check minimum audio length (at least 0.3 seconds)
-        min_samples = int(sample_rate * 0.3)
-        if len(audio_np) < min_samples:
-            logger.info(f"Audio too short ({len(audio_np)} samples), ignoring")
+        if n_samples < int(sample_rate * 0.3):
+            logger.info(f"Audio too short ({n_samples} samples), ignoring")
             return
 
         # Check audio level - reject if too quiet (likely silence/noise)
-        audio_float = audio_np.astype(np.float32) / 32768.0
-        rms_energy = np.sqrt(np.mean(audio_float ** 2))
+        rms_energy = math.sqrt(ssq / n_samples) * INT16_SCALE
         if rms_energy < 0.005:  # Very quiet threshold
             logger.info(f"Audio too quiet (RMS: {rms_energy:.4f}), ignoring")
             return
 
-        logger.info(f"Audio RMS energy: {rms_energy:.4f}")
-
-        # Resample if needed (48kHz -> 16kHz for Whisper)
-        if sample_rate != WHISPER_SAMPLE_RATE:
-            logger.info(f"Resampling audio from {sample_rate}Hz to {WHISPER_SAMPLE_RATE}Hz")
-
-            # Use proper decimation for 48kHz -> 16kHz (factor of 3)
-            # This is more accurate than linear interpolation
-            downsample_factor = sample_rate // WHISPER_SAMPLE_RATE  # 48000/16000 = 3
-
-            if sample_rate == 48000 and WHISPER_SAMPLE_RATE == 16000:
-                # Exact 3x downsampling - use averaging for anti-aliasing
-                audio_float = audio_np.astype(np.float32)
-
-                # Simple low-pass filter before downsampling (moving average)
-                kernel_size = 3
-                if len(audio_float) >= kernel_size:
-                    kernel = np.ones(kernel_size) / kernel_size
-                    audio_float = np.convolve(audio_float, kernel, mode='same')
-
-                # Decimate by taking every 3rd sample
-                new_length = len(audio_float) // downsample_factor
-                audio_np = audio_float[:new_length * downsample_factor:downsample_factor].astype(np.int16)
-            else:
-                # Fallback to interpolation for non-standard rates
-                ratio = WHISPER_SAMPLE_RATE / sample_rate
-                new_length = int(len(audio_np) * ratio)
-                indices = np.linspace(0, len(audio_np) - 1, new_length)
-                audio_np = np.interp(
-                    indices,
-                    np.arange(len(audio_np)),
-                    audio_np.astype(np.float32)
-                ).astype(np.int16)
-
-            sample_rate = WHISPER_SAMPLE_RATE
-
-        # Convert to WAV format for STT
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav:
-            wav.setnchannels(CHANNELS)
-            wav.setsampwidth(BYTES_PER_SAMPLE)
-            wav.setframerate(sample_rate)
-            wav.writeframes(audio_np.tobytes())
-
-        wav_bytes = wav_buffer.getvalue()
-        audio_duration = len(audio_np) / sample_rate
+        audio_duration = n_samples / sample_rate
         latency["audio_duration"] = round(audio_duration * 1000)  # ms
 
-        logger.info(f"Audio prepared: {len(audio_np)} samples at {sample_rate}Hz ({audio_duration:.2f}s)")
+        logger.info(
+            f"Audio RMS energy: {rms_energy:.4f}, duration {audio_duration:.2f}s "
+            f"({len(partials)} part(s) already transcribing)"
+        )
 
         # === STT ===
-        stt_start = time.time()
+        # Only the tail after the last pause is left; earlier parts have been
+        # transcribing while the user was still talking
+        stt_start = time.monotonic_ns()
         logger.info("Transcribing...")
         try:
-            text = await stt.transcribe_async(wav_bytes)
+            texts = list(await asyncio.gather(*partials))
+            if audio_data:
+                texts.append(await self._transcribe_segment(audio_data, sample_rate))
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             return
-        latency["stt_ms"] = round((time.time() - stt_start) * 1000)
+        text = " ".join(t for t in texts if t)
+        latency["stt_ms"] = (time.monotonic_ns() - stt_start) // 1_000_000
 
         if not text or not text.strip():
             logger.info("No speech detected in transcription")
@@ -758,50 +1013,27 @@ class DealershipVoiceAgent:
             return
 
         # Filter out Whisper hallucinations (common patterns when audio is unclear)
-        # Only filter EXACT matches for short text, use substring match for longer phrases
-        exact_hallucinations = {
-            # Single words/sounds that are pure noise
-            "...", "___", "you", "the", "a", "i",
-            # Foreign language artifacts (often appear in noisy audio)
-            "字幕", "視聴", "請訂閱", "谢谢",
-        }
-
-        phrase_hallucinations = [
-            # Multi-word Whisper hallucinations
-            "thank you for watching",
-            "please subscribe",
-            "thanks for watching",
-            "see you next time",
-            "music playing",
-            "[music]",
-            "[silence]",
-            "[applause]",
-            "[laughter]",
-            "you may as well",
-        ]
-
         text_lower = text.lower().strip()
 
         # Check exact match hallucinations (only for very short text)
-        if text_lower in exact_hallucinations:
+        if text_lower in _EXACT_HALLUCINATIONS:
             logger.warning(f"Detected hallucination (exact match), ignoring: '{text}'")
             return
 
         # Check phrase hallucinations (substring match)
-        if any(pattern in text_lower for pattern in phrase_hallucinations):
+        if _PHRASE_HALLUCINATION_RE.search(text_lower):
             logger.warning(f"Detected hallucination (phrase match), ignoring: '{text}'")
             return
 
         # Filter if text is ONLY punctuation/symbols (no letters or numbers at all)
-        alphanumeric_count = sum(1 for c in text if c.isalnum())
-        if alphanumeric_count == 0:
+        if not _ALNUM_RE.search(text):
             logger.warning(f"Text has no alphanumeric characters, ignoring: '{text}'")
             return
 
         logger.info(f"User said: {text} [STT: {latency['stt_ms']}ms]")
 
         # === LLM ===
-        llm_start = time.time()
+        llm_start = time.monotonic_ns()
         try:
             response = await self.http_client.post(
                 "/api/chat",
@@ -812,35 +1044,33 @@ class DealershipVoiceAgent:
             )
             response.raise_for_status()
             data = response.json()
-            latency["llm_ms"] = round((time.time() - llm_start) * 1000)
+            latency["llm_ms"] = (time.monotonic_ns() - llm_start) // 1_000_000
 
             agent_response = data.get("response", "")
             logger.info(f"Agent response: {agent_response} [LLM: {latency['llm_ms']}ms]")
 
             # === TTS ===
-            tts_start = time.time()
+            tts_start = time.monotonic_ns()
             await self.speak(agent_response)
-            latency["tts_ms"] = round((time.time() - tts_start) * 1000)
+            latency["tts_ms"] = (time.monotonic_ns() - tts_start) // 1_000_000
 
             # Total latency
-            latency["total_ms"] = round((time.time() - total_start) * 1000)
+            latency["total_ms"] = (time.monotonic_ns() - total_start) // 1_000_000
 
             # Log latency summary
             logger.info(f"📊 LATENCY: STT={latency['stt_ms']}ms | LLM={latency['llm_ms']}ms | TTS={latency['tts_ms']}ms | TOTAL={latency['total_ms']}ms")
 
-            # Send latency to backend for frontend display
-            try:
-                await self.http_client.post(
-                    "/api/latency",
-                    json={
-                        "session_id": self.session_id,
-                        "latency": latency,
-                        "user_message": text,
-                        "agent_response": agent_response[:100]
-                    }
-                )
-            except Exception:
-                pass  # Non-critical
+            # Send latency to backend for frontend display (non-critical)
+            self._post_in_background(
+                "/api/latency",
+                {
+                    "session_id": self.session_id,
+                    "latency": latency,
+                    "user_message": text,
+                    "agent_response": agent_response[:100]
+                },
+                "report latency"
+            )
 
         except Exception as e:
             logger.error(f"Error getting response: {e}")
@@ -867,9 +1097,6 @@ class DealershipVoiceAgent:
             return
 
         # Use a lock to prevent concurrent speech
-        if not hasattr(self, '_speak_lock'):
-            self._speak_lock = asyncio.Lock()
-
         async with self._speak_lock:
             # Check if audio source is valid
             if not self.audio_source or not self._running:
@@ -878,80 +1105,123 @@ class DealershipVoiceAgent:
 
             # Reset interrupt flag before speaking
             self._interrupt_speaking = False
-            self._barge_in_frames = 0
 
             self.is_speaking = True
+            self._speech_done.clear()
             logger.info(f"Speaking: {text[:50]}...")
 
             try:
-                # Synthesize audio
-                wav_bytes = await tts.synthesize_async(text)
-
-                if not wav_bytes:
-                    logger.warning("TTS returned empty audio")
-                    return
-
-                # Parse WAV and get raw audio
-                with io.BytesIO(wav_bytes) as wav_buffer:
-                    with wave.open(wav_buffer, 'rb') as wav:
-                        tts_sample_rate = wav.getframerate()
-                        audio_data = wav.readframes(wav.getnframes())
-
-                # Convert to numpy
-                audio_np = np.frombuffer(audio_data, dtype=np.int16)
-
-                # Resample if needed (TTS is typically 22050Hz or 24000Hz, LiveKit wants 48000Hz)
-                if tts_sample_rate != SAMPLE_RATE:
-                    ratio = SAMPLE_RATE / tts_sample_rate
-                    new_length = int(len(audio_np) * ratio)
-                    indices = np.floor(np.arange(new_length) / ratio).astype(int)
-                    indices = np.clip(indices, 0, len(audio_np) - 1)
-                    audio_np = audio_np[indices]
-
-                # Send in chunks (20ms frames)
-                samples_per_frame = SAMPLE_RATE // 50  # 20ms = 960 samples at 48kHz
-                was_interrupted = False
-
-                for i in range(0, len(audio_np), samples_per_frame):
-                    if not self._running:
-                        break
-
-                    # Check for barge-in (user interruption)
-                    if self._interrupt_speaking:
-                        logger.info("🛑 Speech interrupted by user barge-in")
-                        was_interrupted = True
-                        break
-
-                    chunk = audio_np[i:i + samples_per_frame]
-                    if len(chunk) < samples_per_frame:
-                        # Pad last chunk with silence
-                        chunk = np.pad(chunk, (0, samples_per_frame - len(chunk)))
-
-                    frame = rtc.AudioFrame(
-                        data=chunk.tobytes(),
-                        sample_rate=SAMPLE_RATE,
-                        num_channels=CHANNELS,
-                        samples_per_channel=samples_per_frame,
+                tts = get_kokoro_tts()
+                resampler = None
+                if tts.sample_rate != SAMPLE_RATE:
+                    # TTS is typically 24000Hz, LiveKit wants 48000Hz
+                    resampler = soxr.ResampleStream(
+                        tts.sample_rate, SAMPLE_RATE, CHANNELS, dtype='int16', quality='HQ'
                     )
 
-                    try:
-                        await self.audio_source.capture_frame(frame)
-                    except Exception as frame_error:
-                        if "InvalidState" in str(frame_error):
-                            logger.warning("Audio source disconnected, stopping speech")
+                leftover = np.empty(0, dtype=np.int16)  # Tail shorter than one frame
+                got_audio = False
+                stop_reason = None
+
+                # Play each chunk as soon as TTS produces it
+                async with contextlib.aclosing(tts.synthesize_stream_async(text)) as chunks:
+                    async for chunk in chunks:
+                        got_audio = True
+                        if resampler is not None:
+                            chunk = resampler.resample_chunk(chunk)
+                        audio_np = np.concatenate([leftover, chunk]) if leftover.size else chunk
+                        n_full = len(audio_np) - len(audio_np) % FRAME_SAMPLES
+                        leftover = audio_np[n_full:]
+                        stop_reason = await self._play_pcm(audio_np[:n_full])
+                        if stop_reason:
                             break
-                        raise
 
-                if was_interrupted:
-                    logger.info("Agent speech stopped due to barge-in")
+                if not got_audio:
+                    logger.warning("TTS returned empty audio")
+                    return
 
-                    # Small delay to maintain proper playback rate
-                    await asyncio.sleep(0.018)  # ~20ms
+                if stop_reason is None:
+                    # Flush the resampler and pad the final partial frame with silence
+                    tail = leftover
+                    if resampler is not None:
+                        flushed = resampler.resample_chunk(np.empty(0, dtype=np.int16), last=True)
+                        tail = np.concatenate([tail, flushed])
+                    pad = (-len(tail)) % FRAME_SAMPLES
+                    if pad:
+                        tail = np.concatenate([tail, np.zeros(pad, dtype=np.int16)])
+                    stop_reason = await self._play_pcm(tail)
+
+                if stop_reason == "interrupted":
+                    logger.info("Agent speech stopped due to barge-in")
 
             except Exception as e:
                 logger.error(f"Error speaking: {e}", exc_info=True)
             finally:
                 self.is_speaking = False
+                self._speech_done.set()
+
+    async def _wait_for_speech_done(self, timeout: float):
+        """Wait until the agent stops speaking, giving up after timeout seconds."""
+        try:
+            await asyncio.wait_for(self._speech_done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _play_pcm(self, audio_np: np.ndarray) -> Optional[str]:
+        """
+        Send whole 10ms frames of 48kHz int16 PCM to the audio source.
+
+        The source has no queue, so frames are paced in real time against
+        _play_deadline (carried across calls so consecutive TTS chunks play
+        back to back). This also lets a barge-in stop playback within a frame.
+
+        Returns:
+            None when every frame was sent, "interrupted" on barge-in, or
+            "stopped" if the agent stopped or the audio source went away
+        """
+        bytes_per_frame = FRAME_SAMPLES * BYTES_PER_SAMPLE
+
+        # One contiguous byte view over the audio; frames are zero-copy
+        # slices of it (AudioFrame copies into its own buffer). Build them
+        # all up front so the capture loop below only awaits.
+        pcm = memoryview(np.ascontiguousarray(audio_np)).cast('B')
+        frames = [
+            rtc.AudioFrame(
+                data=pcm[offset:offset + bytes_per_frame],
+                sample_rate=SAMPLE_RATE,
+                num_channels=CHANNELS,
+                samples_per_channel=FRAME_SAMPLES,
+            )
+            for offset in range(0, len(pcm), bytes_per_frame)
+        ]
+
+        loop = asyncio.get_running_loop()
+        for frame in frames:
+            delay = self._play_deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if not self._running:
+                return "stopped"
+
+            # Check for barge-in (user interruption)
+            if self._interrupt_speaking:
+                logger.info("🛑 Speech interrupted by user barge-in")
+                return "interrupted"
+
+            try:
+                await self.audio_source.capture_frame(frame)
+            except Exception as frame_error:
+                if "InvalidState" in str(frame_error):
+                    logger.warning("Audio source disconnected, stopping speech")
+                    return "stopped"
+                raise
+
+            # Restart the clock after a gap (new utterance, slow TTS chunk)
+            # instead of bursting to catch up
+            self._play_deadline = max(self._play_deadline, loop.time()) + FRAME_DURATION_S
+
+        return None
 
 
 def create_agent():
@@ -1,7 +1,10 @@
 import asyncio
+import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+import redis
 from livekit import rtc
 from livekit.agents import AutoSubscribe, JobContext, WorkerOptions, cli
 
@@ -11,8 +14,16 @@ from .stt import stt
 
 settings = get_voice_settings()
 
+# Shared Redis connections for status updates (connects lazily on first use)
+_redis = redis.Redis(
+    connection_pool=redis.ConnectionPool.from_url(settings.redis_url, max_connections=4)
+)
+# Status writes are advisory - one background thread keeps them off the
+# model-loading path and in order
+_status_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redis-status")
+
 # Kokoro TTS
-from .tts_kokoro import kokoro_tts_instance as tts
+from .tts_kokoro import get_kokoro_tts
 
 # Configure logging - use our own logger, disable LiveKit's JSON logger
 logging.basicConfig(
@@ -51,13 +62,21 @@ def prewarm_process(proc):
 
     # Load TTS model
     try:
-        tts.load_model()
+        get_kokoro_tts().load_model()
         status["tts_loaded"] = True
         update_status_in_redis(status)
         logger.info("TTS model loaded in worker process")
     except Exception as e:
         logger.error(f"Failed to load TTS model: {e}")
 
+    # Warm up inference so the first job doesn't pay for CUDA init
+    # (Kokoro warms itself up at the end of load_model)
+    if status["stt_loaded"]:
+        try:
+            stt.warmup()
+        except Exception as e:
+            logger.warning(f"STT warmup failed: {e}")
+
     status["ready"] = status["stt_loaded"] and status["tts_loaded"]
     update_status_in_redis(status)
     logger.info("Worker process prewarming complete")
@@ -147,13 +166,15 @@ async def entrypoint(ctx: JobContext):
 
 
 def update_status_in_redis(status: dict):
-    """Update voice worker status in Redis."""
-    import redis
+    """Update voice worker status in Redis (non-blocking)."""
+    # Serialize now - the caller keeps mutating the dict
+    _status_executor.submit(_write_status, json.dumps(status))
+
+
+def _write_status(payload: str):
+    """Write a serialized status to Redis (runs on the status thread)."""
     try:
-        r = redis.from_url(settings.redis_url)
-        import json
-        r.set("voice_worker:status", json.dumps(status), ex=300)
-        r.close()
+        _redis.set("voice_worker:status", payload, ex=300)
     except Exception as e:
         logger.warning(f"Failed to update Redis status: {e}")
 
@@ -1,20 +1,19 @@
 import asyncio
+import os
+import threading
 import numpy as np
-from typing import Optional, Union
+from typing import AsyncIterator, List, Optional, Union
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 import io
 import wave
 
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
+from ._executor import VOICE_EXECUTOR
 from .config import get_voice_settings
 
 settings = get_voice_settings()
 
-# Thread pool for CPU-bound transcription
-_executor = ThreadPoolExecutor(max_workers=2)
-
 # Context prompt to help Whisper understand the domain
 WHISPER_PROMPT = """Car dealership customer service conversation. The customer is speaking about:
 test drive, oil change, brake service, tire rotation, appointment, schedule, booking.
@@ -22,6 +21,16 @@ Vehicle brands and models: Honda Civic, Toyota Camry, Ford F-150, Chevrolet Mali
 BMW 3 Series, Mercedes C-Class, Volkswagen Golf 7, Golf GTI, Passat, Jetta, Tiguan.
 Common phrases: I want to book, I'd like to schedule, test drive please, Golf 7, tomorrow, next week."""
 
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def _pcm16_to_float32(pcm: Union[bytes, np.ndarray]) -> np.ndarray:
+    """Convert int16 PCM to float32 in [-1, 1) in a single pass."""
+    view = np.frombuffer(pcm, dtype=np.int16) if isinstance(pcm, (bytes, bytearray, memoryview)) else pcm
+    out = np.empty(view.shape, dtype=np.float32)
+    np.multiply(view, _INT16_SCALE, out=out, casting='unsafe')
+    return out
+
 
 class SpeechToText:
     """
@@ -33,6 +42,8 @@ class SpeechToText:
 
     def __init__(self):
         self.model: Optional[WhisperModel] = None
+        self.batched_model: Optional[BatchedInferencePipeline] = None
+        self._prompt_tokens: Optional[List[int]] = None
         self._model_loaded = False
 
     @property
@@ -47,85 +58,176 @@ class SpeechToText:
         print(f"Loading Whisper model: {settings.whisper_model}")
         print(f"Device: {settings.whisper_device}")
 
-        # Use INT8 quantization for better memory efficiency on limited VRAM
-        compute_type = "int8"
+        # INT8 weights for memory efficiency on limited VRAM; on GPU keep
+        # activations in fp16 so the math runs on tensor cores
+        compute_type = settings.whisper_compute_type or (
+            "int8_float16" if settings.whisper_device == "cuda" else "int8"
+        )
+        print(f"Compute type: {compute_type}")
+
+        # Extra workers overlap feature extraction with decoding on CPU; on
+        # GPU the decoder is the bottleneck so one worker is enough
+        num_workers = 1 if settings.whisper_device == "cuda" else 2
+        cpu_threads = settings.whisper_cpu_threads or max(1, (os.cpu_count() or 2) // 2)
 
         self.model = WhisperModel(
             settings.whisper_model,
             device=settings.whisper_device,
             compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
             download_root=str(Path(settings.models_path) / "whisper")
         )
 
+        # Tokenize the fixed domain prompt once instead of on every call
+        # (same encoding faster-whisper applies to a string initial_prompt).
+        # Only WhisperModel.transcribe accepts ids - the batched pipeline
+        # always re-encodes initial_prompt and needs the string.
+        self._prompt_tokens = self.model.hf_tokenizer.encode(
+            " " + WHISPER_PROMPT.strip(), add_special_tokens=False
+        ).ids
+
+        # Decode an utterance's VAD segments together instead of one by one
+        if settings.whisper_batch_size > 0:
+            self.batched_model = BatchedInferencePipeline(model=self.model)
+
         self._model_loaded = True
         print("Whisper model loaded successfully")
 
+    def warmup(self):
+        """
+        Run one throwaway decode so CUDA context setup and kernel selection
+        happen before the first real utterance, not during it.
+        """
+        if not self._model_loaded:
+            self.load_model()
+
+        # Same path and prompt as real utterances; vad_filter off - otherwise
+        # silence is trimmed and nothing is decoded
+        segments = self._segments(
+            np.zeros(16000, dtype=np.float32), settings.whisper_beam_size, vad_filter=False
+        )
+        for _ in segments:
+            pass
+
     async def transcribe(
         self,
         audio_data: Union[bytes, np.ndarray],
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        beam_size: Optional[int] = None
     ) -> str:
         """
         Transcribe audio to text.
 
         Args:
-            audio_data: Audio as bytes or numpy array
+            audio_data: Audio as WAV/PCM bytes, int16 PCM array or float32
+                array already normalized to [-1, 1]
             sample_rate: Audio sample rate (default 16000 Hz)
+            beam_size: Decoder beam width (default settings.whisper_beam_size;
+                1 = greedy, use 5 for offline/high-accuracy transcripts)
 
         Returns:
             Transcribed text
         """
-        if not self._model_loaded:
-            self.load_model()
+        parts = [
+            text async for text in self.transcribe_stream(audio_data, sample_rate, beam_size)
+        ]
+        return " ".join(parts)
 
-        # Convert bytes to numpy if needed
-        if isinstance(audio_data, bytes):
-            audio_array = self._bytes_to_numpy(audio_data, sample_rate)
-        else:
-            audio_array = audio_data
+    async def transcribe_stream(
+        self,
+        audio_data: Union[bytes, np.ndarray],
+        sample_rate: int = 16000,
+        beam_size: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream transcription segment by segment.
+
+        Whisper decodes segments lazily; each segment's text is yielded as
+        soon as it is decoded instead of after the whole clip. Arguments are
+        the same as transcribe().
 
-        # Ensure float32 and correct shape
-        audio_array = audio_array.astype(np.float32)
+        Closing the generator early stops decoding after the current segment.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._model_loaded:
+            await loop.run_in_executor(VOICE_EXECUTOR, self.load_model)
 
-        # Normalize if needed
-        if audio_array.max() > 1.0:
-            audio_array = audio_array / 32768.0
+        audio_array = self._to_float32(audio_data, sample_rate)
+        beam_size = beam_size or settings.whisper_beam_size
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
 
-        # Run transcription in thread pool to avoid blocking event loop
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(
-            _executor,
-            self._transcribe_sync,
-            audio_array
-        )
+        def _produce():
+            # Runs in the thread pool; decoding happens as segments are pulled
+            try:
+                for segment in self._segments(audio_array, beam_size):
+                    if stop.is_set():
+                        break
+                    text = segment.text.strip()
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
 
-        return text.strip()
+        loop.run_in_executor(VOICE_EXECUTOR, _produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
 
-    def _transcribe_sync(self, audio_array: np.ndarray) -> str:
-        """Synchronous transcription (runs in thread pool)."""
+    def _to_float32(self, audio_data: Union[bytes, np.ndarray], sample_rate: int) -> np.ndarray:
+        """Bring any supported input to float32 PCM in [-1, 1]."""
+        # Convert bytes to numpy if needed
+        if isinstance(audio_data, bytes):
+            return self._bytes_to_numpy(audio_data, sample_rate)
+        if audio_data.dtype == np.int16:
+            # Raw 16-bit PCM
+            return _pcm16_to_float32(audio_data)
+        # Float audio - normalization is the caller's job, so no range scan
+        # (no copy if the caller already passed float32)
+        return audio_data.astype(np.float32, copy=False)
+
+    def _segments(self, audio_array: np.ndarray, beam_size: int, vad_filter: bool = True):
+        """Start transcription and return faster-whisper's lazy segment iterator."""
         # Transcribe with context prompt for better accuracy
-        segments, info = self.model.transcribe(
+        if self.batched_model is not None:
+            transcribe = self.batched_model.transcribe
+            batch_kwargs = {"batch_size": settings.whisper_batch_size}
+            prompt = WHISPER_PROMPT
+        else:
+            transcribe = self.model.transcribe
+            batch_kwargs = {}
+            prompt = self._prompt_tokens
+
+        segments, info = transcribe(
             audio_array,
             language="en",
-            initial_prompt=WHISPER_PROMPT,
-            beam_size=5,
-            best_of=3,
+            initial_prompt=prompt,
+            beam_size=beam_size,
             patience=1.0,
-            temperature=0.0,
+            temperature=0.0,  # Deterministic, so best_of (sampling) never applies
             compression_ratio_threshold=2.4,
-            condition_on_previous_text=True,
-            vad_filter=True,
+            # Don't feed earlier segments back as context - avoids repetition loops
+            condition_on_previous_text=False,
+            vad_filter=vad_filter,
             vad_parameters=dict(
                 min_silence_duration_ms=300,  # Reduced from 500ms
                 speech_pad_ms=250,  # Increased padding
                 threshold=0.5,
                 min_speech_duration_ms=100
-            )
+            ),
+            **batch_kwargs
         )
-
-        # Combine segments
-        text = " ".join(segment.text.strip() for segment in segments)
-        return text
+        return segments
 
     def _bytes_to_numpy(self, audio_bytes: bytes, sample_rate: int) -> np.ndarray:
         """Convert raw audio bytes to numpy array."""
@@ -134,33 +236,35 @@ class SpeechToText:
             with io.BytesIO(audio_bytes) as f:
                 with wave.open(f, 'rb') as wav:
                     frames = wav.readframes(wav.getnframes())
-                    audio = np.frombuffer(frames, dtype=np.int16)
-                    return audio.astype(np.float32) / 32768.0
+                    return _pcm16_to_float32(frames)
         except Exception:
             pass
 
         # Assume raw PCM 16-bit
-        audio = np.frombuffer(audio_bytes, dtype=np.int16)
-        return audio.astype(np.float32) / 32768.0
+        return _pcm16_to_float32(audio_bytes)
 
     def transcribe_sync(
         self,
         audio_data: Union[bytes, np.ndarray],
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        beam_size: Optional[int] = None
     ) -> str:
-        """Synchronous transcription (for non-async contexts)."""
-        import asyncio
-        return asyncio.get_event_loop().run_until_complete(
-            self.transcribe(audio_data, sample_rate)
-        )
+        """Synchronous transcription (for non-async contexts, e.g. worker threads)."""
+        if not self._model_loaded:
+            self.load_model()
+
+        audio_array = self._to_float32(audio_data, sample_rate)
+        segments = self._segments(audio_array, beam_size or settings.whisper_beam_size)
+        return " ".join(text for text in (s.text.strip() for s in segments) if text)
 
     async def transcribe_async(
         self,
         audio_data: Union[bytes, np.ndarray],
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        beam_size: Optional[int] = None
     ) -> str:
         """Alias for transcribe method."""
-        return await self.transcribe(audio_data, sample_rate)
+        return await self.transcribe(audio_data, sample_rate, beam_size)
 
 
 # Global instance
@@ -8,22 +8,23 @@ Model: https://huggingface.co/hexgrad/Kokoro-82M
 """
 
 import asyncio
-import io
-import wave
+import contextlib
+import struct
+import threading
 import logging
-from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional
 
 import numpy as np
 
+from ._executor import VOICE_EXECUTOR
+from ._pcm_kernels import f32_to_pcm16
 from .config import get_voice_settings
 
 settings = get_voice_settings()
 logger = logging.getLogger("voice_worker.tts_kokoro")
 
-# Thread pool for CPU/GPU-bound TTS
-_executor = ThreadPoolExecutor(max_workers=2)
-
 # Available Kokoro voices (subset - see full list at huggingface)
 VOICE_OPTIONS = {
     # American English
@@ -39,6 +40,85 @@ VOICE_OPTIONS = {
 
 DEFAULT_VOICE = "af_heart"  # Warm, friendly female voice - good for customer service
 
+# Only short, likely-repeated phrases are cached; long LLM replies rarely recur
+CACHE_MAX_TEXT_LEN = 200
+
+# Split input at sentence ends (KPipeline's default only splits on newlines),
+# so the first sentence is playing while the next one is synthesized
+SENTENCE_SPLIT_PATTERN = r"(?<=[.!?])\s+|\n+"
+
+# One Kokoro forward already saturates a CPU or small GPU; further requests
+# wait here instead of occupying VOICE_EXECUTOR threads that STT also needs
+# (settings.kokoro_max_concurrency raises the limit on GPUs that fit more)
+_inference_sem = asyncio.Semaphore(max(1, settings.kokoro_max_concurrency))
+
+
+@lru_cache(maxsize=8)
+def _wav_fmt_block(sample_rate: int, channels: int, bits: int) -> bytes:
+    """The size-independent middle of a PCM WAV header ("WAVE" .. "data")."""
+    block_align = channels * bits // 8
+    return struct.pack(
+        "<4s4sIHHIIHH4s",
+        b"WAVE", b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align,
+        block_align, bits, b"data",
+    )
+
+
+def _wav_header(n_samples: int, sample_rate: int, channels: int = 1, bits: int = 16) -> bytes:
+    """Build the 44-byte PCM WAV header for n_samples frames."""
+    data_size = n_samples * (channels * bits // 8)
+    # Only the two size fields change between calls
+    return struct.pack(
+        "<4sI32sI", b"RIFF", 36 + data_size, _wav_fmt_block(sample_rate, channels, bits), data_size
+    )
+
+
+def _join_chunks(chunks: List[np.ndarray], dtype) -> np.ndarray:
+    """Copy chunks into one array of dtype, allocated once at the total size."""
+    if len(chunks) == 1 and chunks[0].dtype == dtype:
+        # Short phrases usually come back as one segment - nothing to join
+        return chunks[0]
+    out = np.empty(sum(c.size for c in chunks), dtype=dtype)
+    offset = 0
+    for chunk in chunks:
+        out[offset:offset + chunk.size] = chunk
+        offset += chunk.size
+    return out
+
+
+# One pipeline (model weights + voice packs) per language, shared by every
+# KokoroTextToSpeech instance; voices are chosen per call
+_PIPELINES: dict = {}
+_PIPELINES_LOCK = threading.Lock()
+
+
+def _get_pipeline(lang_code: str):
+    """Return the process-wide KPipeline for lang_code, creating it on first use."""
+    with _PIPELINES_LOCK:
+        pipeline = _PIPELINES.get(lang_code)
+        if pipeline is None:
+            from kokoro import KPipeline
+
+            # lang_code: 'a' = American English, 'b' = British English, etc.
+            pipeline = KPipeline(lang_code=lang_code)
+            if settings.kokoro_dtype == "int8":
+                _quantize_int8(pipeline)
+            _PIPELINES[lang_code] = pipeline
+        return pipeline
+
+
+def _quantize_int8(pipeline):
+    """Dynamically quantize the pipeline's Linear/LSTM weights (CPU only)."""
+    import torch
+
+    if pipeline.model.device.type == "cuda":
+        logger.warning("Kokoro int8 quantization is CPU-only, using fp32")
+        return
+    pipeline.model = torch.quantization.quantize_dynamic(
+        pipeline.model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+    )
+    logger.info("Kokoro running in int8")
+
 
 class KokoroTextToSpeech:
     """
@@ -63,9 +143,18 @@ class KokoroTextToSpeech:
         self.voice = voice or settings.kokoro_voice or DEFAULT_VOICE
         self.lang_code = lang_code or settings.kokoro_lang_code or "a"
         self._pipeline = None
+        self._voices: dict = {}  # voice id -> preloaded voice-pack tensor
+        self._autocast = None  # torch.autocast factory when running in fp16
+        self._inference_mode = None  # torch.inference_mode, bound at load time
         self._loaded = False
         self._sample_rate = 24000  # Kokoro outputs 24kHz
 
+        # LRU of synthesized int16 PCM keyed on (text, voice, lang) - repeated
+        # prompts (greetings, farewells, error replies) skip re-synthesis
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._cache_size = settings.tts_cache_size
+        self._cache_lock = threading.Lock()
+
     def load_model(self):
         """Load the Kokoro pipeline."""
         if self._loaded:
@@ -74,25 +163,182 @@ class KokoroTextToSpeech:
         logger.info(f"Loading Kokoro TTS (voice: {self.voice}, lang: {self.lang_code})")
 
         try:
-            from kokoro import KPipeline
+            import kokoro  # noqa: F401
         except ImportError:
             raise ImportError(
                 "Kokoro not installed. Install with: pip install kokoro>=0.9.2\n"
                 "Also install espeak-ng: https://github.com/espeak-ng/espeak-ng/releases"
             )
 
-        # Initialize the pipeline
-        # lang_code: 'a' = American English, 'b' = British English, etc.
-        self._pipeline = KPipeline(lang_code=self.lang_code)
+        import torch
+
+        # Keep CPU inference from oversubscribing cores that Whisper and the
+        # event loop also need
+        if settings.kokoro_torch_threads > 0:
+            torch.set_num_threads(settings.kokoro_torch_threads)
+
+        self._pipeline = _get_pipeline(self.lang_code)
+        self._inference_mode = torch.inference_mode
+        self._apply_dtype(settings.kokoro_dtype)
+
+        # The configured voice must resolve - fail here, not mid-reply
+        try:
+            self._voices[self.voice] = self._pipeline.load_voice(self.voice)
+        except Exception as e:
+            raise ValueError(f"Invalid Kokoro voice {self.voice!r}: {e}") from e
+
+        # Resolve the other packs for this pipeline's language once so
+        # synthesis passes a tensor instead of a name (no lookup or
+        # deserialization, and voice switches are free). Voice ids start with
+        # their lang code ('af_heart' -> 'a'); other languages are skipped.
+        for voice in VOICE_OPTIONS.values():
+            if voice in self._voices or voice[0] != self.lang_code:
+                continue
+            try:
+                self._voices[voice] = self._pipeline.load_voice(voice)
+            except Exception as e:
+                logger.warning(f"Could not preload Kokoro voice {voice}: {e}")
+
         self._loaded = True
 
         logger.info(f"Kokoro TTS loaded successfully (sample rate: {self._sample_rate})")
 
+        if settings.kokoro_warmup:
+            try:
+                self.warmup()
+            except Exception as e:
+                logger.warning(f"Kokoro warmup failed: {e}")
+
+    def _apply_dtype(self, dtype: str):
+        """Run this instance's inference in fp16 autocast, if requested and supported."""
+        # int8 is applied to the shared pipeline when it is created
+        if dtype != "fp16":
+            return
+
+        import torch
+
+        if self._pipeline.model.device.type != "cuda":
+            logger.warning("Kokoro fp16 autocast is CUDA-only, using fp32")
+            return
+        # Autocast rather than .half(): the pipeline feeds fp32 voice packs
+        self._autocast = lambda: torch.autocast("cuda", dtype=torch.float16)
+        logger.info("Kokoro running in fp16")
+
+    def warmup(self):
+        """
+        Run one throwaway synthesis so voice-pack loading, CUDA context setup
+        and kernel selection happen before the first real reply.
+        """
+        if not self._loaded:
+            self.load_model()
+
+        # Straight through the pipeline - bypasses (and doesn't fill) the cache
+        for _ in self._float_segments("Hello."):
+            pass
+
+    def _cache_get(self, text: str) -> Optional[np.ndarray]:
+        """Return cached PCM for text, marking it most recently used."""
+        key = (text, self.voice, self.lang_code)
+        with self._cache_lock:
+            pcm = self._cache.get(key)
+            if pcm is not None:
+                self._cache.move_to_end(key)
+            return pcm
+
+    def _cache_put(self, text: str, pcm: np.ndarray):
+        """Store PCM for text, evicting the least recently used entries."""
+        if self._cache_size <= 0 or len(text) > CACHE_MAX_TEXT_LEN:
+            return
+        key = (text, self.voice, self.lang_code)
+        with self._cache_lock:
+            self._cache[key] = pcm
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
     @property
     def sample_rate(self) -> int:
         """Get the output sample rate."""
         return self._sample_rate
 
+    def _float_segments(self, text: str) -> Iterator[np.ndarray]:
+        """Yield float32 audio for each segment as the pipeline produces it."""
+        voice = self._voices.get(self.voice, self.voice)
+        # No autograd bookkeeping: less memory, and more of the forward runs
+        # in torch's C++ code with the GIL released
+        with self._inference_mode(), \
+                (self._autocast() if self._autocast else contextlib.nullcontext()):
+            for _, _, audio in self._pipeline(
+                text, voice=voice, split_pattern=SENTENCE_SPLIT_PATTERN
+            ):
+                if audio is not None:
+                    # Autocast output may be fp16; callers always get float32
+                    yield np.asarray(audio, dtype=np.float32)
+
+    def _generate(self, text: str) -> Optional[np.ndarray]:
+        """Run the Kokoro pipeline over text; float32 samples, or None if it produced nothing."""
+        audio_chunks = list(self._float_segments(text))
+        if not audio_chunks:
+            return None
+        return _join_chunks(audio_chunks, np.float32)
+
+    def _pcm_segments(self, text: str) -> Iterator[np.ndarray]:
+        """Yield int16 PCM for each segment as the pipeline produces it."""
+        for audio in self._float_segments(text):
+            yield f32_to_pcm16(audio)
+
+    def synthesize_stream(self, text: str) -> Iterator[np.ndarray]:
+        """
+        Synthesize text segment by segment.
+
+        Yields int16 PCM (at sample_rate) per Kokoro segment, so callers can
+        start sending audio before the whole text is rendered. The complete
+        utterance is cached once the generator is exhausted; closing it early
+        skips the cache.
+        """
+        if not self._loaded:
+            self.load_model()
+
+        if not text.strip():
+            return
+
+        cached = self._cache_get(text)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for pcm in self._pcm_segments(text):
+            chunks.append(pcm)
+            yield pcm
+        if chunks:
+            self._cache_put(text, _join_chunks(chunks, np.int16))
+
+    def _synthesize_float(self, text: str) -> List[np.ndarray]:
+        """Model forward only: the float32 segments for text (the part worth a thread)."""
+        return list(self._float_segments(text))
+
+    def _encode_pcm(self, text: str, chunks: List[np.ndarray]) -> np.ndarray:
+        """Convert float32 segments to one int16 array and cache it."""
+        # Size the output once and convert every segment straight into
+        # it - no per-segment int16 arrays and no concatenation
+        audio_int16 = np.empty(sum(c.size for c in chunks), dtype=np.int16)
+        offset = 0
+        for chunk in chunks:
+            f32_to_pcm16(chunk, audio_int16[offset:])
+            offset += chunk.size
+        self._cache_put(text, audio_int16)
+        return audio_int16
+
+    def _encode_wav(self, audio_int16: np.ndarray) -> bytes:
+        """Prefix int16 PCM with its WAV header."""
+        # Header + PCM assembled with a single copy: join reads the PCM
+        # through a memoryview instead of materializing tobytes() first
+        return b"".join((
+            _wav_header(len(audio_int16), self._sample_rate),
+            memoryview(audio_int16),
+        ))
+
     def synthesize(self, text: str) -> bytes:
         """
         Synthesize text to audio.
@@ -110,46 +356,105 @@ class KokoroTextToSpeech:
             return b""
 
         try:
-            # Generate audio using Kokoro pipeline
-            audio_chunks = []
+            audio_int16 = self._cache_get(text)
+            if audio_int16 is None:
+                chunks = self._synthesize_float(text)
+                if not chunks:
+                    logger.warning("Kokoro returned no audio")
+                    return b""
+                audio_int16 = self._encode_pcm(text, chunks)
 
-            for _, _, audio in self._pipeline(text, voice=self.voice):
-                if audio is not None:
-                    audio_chunks.append(audio)
+            return self._encode_wav(audio_int16)
 
-            if not audio_chunks:
-                logger.warning("Kokoro returned no audio")
-                return b""
+        except Exception as e:
+            logger.error(f"Kokoro synthesis error: {e}")
+            return b""
 
-            # Concatenate all audio chunks
-            full_audio = np.concatenate(audio_chunks)
+    async def synthesize_async(self, text: str) -> bytes:
+        """
+        Async version of synthesize.
 
-            # Convert float32 audio to int16 WAV
-            audio_int16 = (full_audio * 32767).astype(np.int16)
+        Only the model forward runs in the thread pool; the cache lookup,
+        int16 conversion and WAV header are cheap and stay on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._loaded:
+            # Load model in thread pool to not block event loop
+            await loop.run_in_executor(VOICE_EXECUTOR, self.load_model)
 
-            # Create WAV buffer
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wav:
-                wav.setnchannels(1)
-                wav.setsampwidth(2)  # 16-bit
-                wav.setframerate(self._sample_rate)
-                wav.writeframes(audio_int16.tobytes())
+        if not text.strip():
+            return b""
 
-            return wav_buffer.getvalue()
+        try:
+            audio_int16 = self._cache_get(text)
+            if audio_int16 is None:
+                async with _inference_sem:
+                    chunks = await loop.run_in_executor(
+                        VOICE_EXECUTOR, self._synthesize_float, text
+                    )
+                if not chunks:
+                    logger.warning("Kokoro returned no audio")
+                    return b""
+                audio_int16 = self._encode_pcm(text, chunks)
+
+            return self._encode_wav(audio_int16)
 
         except Exception as e:
             logger.error(f"Kokoro synthesis error: {e}")
             return b""
 
-    async def synthesize_async(self, text: str) -> bytes:
-        """Async version of synthesize."""
+    async def synthesize_stream_async(self, text: str) -> AsyncIterator[np.ndarray]:
+        """
+        Stream synthesis chunk by chunk.
+
+        Kokoro generates audio per sentence; each segment is yielded as
+        int16 PCM (at sample_rate) as soon as the pipeline produces it, so
+        playback can start before the whole text is synthesized.
+
+        Closing the generator early (e.g. on barge-in) stops synthesis after
+        the segment currently being generated.
+        """
+        loop = asyncio.get_running_loop()
         if not self._loaded:
-            # Load model in thread pool to not block event loop
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(_executor, self.load_model)
+            await loop.run_in_executor(VOICE_EXECUTOR, self.load_model)
 
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self.synthesize, text)
+        if not text.strip():
+            return
+
+        cached = self._cache_get(text)
+        if cached is not None:
+            yield cached
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def _produce():
+            # Breaking out closes synthesize_stream, so utterances cut off by
+            # barge-in are never cached
+            try:
+                for pcm in self.synthesize_stream(text):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, pcm)
+            except Exception as e:
+                logger.error(f"Kokoro synthesis error: {e}")
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        # Held until the producer thread actually finishes, not just until
+        # the consumer stops reading
+        await _inference_sem.acquire()
+        producer = loop.run_in_executor(VOICE_EXECUTOR, _produce)
+        producer.add_done_callback(lambda _: _inference_sem.release())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            stop.set()
 
     def synthesize_to_numpy(self, text: str) -> np.ndarray:
         """
@@ -165,20 +470,18 @@ class KokoroTextToSpeech:
             return np.array([], dtype=np.float32)
 
         try:
-            audio_chunks = []
-            for _, _, audio in self._pipeline(text, voice=self.voice):
-                if audio is not None:
-                    audio_chunks.append(audio)
-
-            if not audio_chunks:
+            # Straight from the pipeline - no int16/WAV round-trip
+            audio = self._generate(text)
+            if audio is None:
                 return np.array([], dtype=np.float32)
-
-            return np.concatenate(audio_chunks)
+            return audio
 
         except Exception as e:
             logger.error(f"Kokoro synthesis error: {e}")
             return np.array([], dtype=np.float32)
 
 
-# Global instance
-kokoro_tts_instance = KokoroTextToSpeech()
+@lru_cache()
+def get_kokoro_tts() -> KokoroTextToSpeech:
+    """Process-wide TTS instance, created on first use rather than at import."""
+    return KokoroTextToSpeech()